@@ -5,25 +5,73 @@ This module initializes the Flask web application and handles routing
 for the temperature control system interface.
 """
 
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
+from flask import Flask, render_template, jsonify, request, session, redirect, url_for, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
 from flask_wtf.csrf import CSRFProtect
+from flask_compress import Compress
+from werkzeug.middleware.proxy_fix import ProxyFix
+import orjson
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import os
+import queue
 import atexit
-from threading import Thread
+from functools import wraps
+from threading import Lock
 import time
+from datetime import datetime
+from cachetools import TTLCache
 
 from config import Config, SystemConfig
 from control import TemperatureController
 from evok_mock import create_evok_client
-from auth import check_auth, requires_auth, requires_super_admin
+from auth import (check_auth, login_rate_limited, record_login_failure, clear_login_failures,
+                  requires_auth, requires_super_admin)
 from database import Database
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider using orjson for faster serialization of API responses."""
+
+    def _options(self, pretty: bool = False) -> int:
+        # Datetimes are passed through to Flask's default handler to keep
+        # the same output format as the stdlib-based provider
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default,
+                            option=self._options('indent' in kwargs)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(pretty) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 # Initialize Flask application
 app = Flask(__name__)
-app.config.from_object(Config)
+app.json = OrjsonProvider(app)
+# Skip key sorting and pretty-printing (also in debug mode) for all API responses
+app.json.sort_keys = False
+app.json.compact = True
+app.config.from_object(Config.from_env())
+
+# Behind nginx, take the client address from X-Forwarded-For so per-client
+# login throttling sees real clients. Only trusted when configured, since a
+# directly exposed server would let clients pick their own address.
+if app.config['TRUSTED_PROXY_COUNT'] > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
 
 # Initialize CSRF protection
 # Note: WTF_CSRF_CHECK_DEFAULT=False means CSRF is disabled by default
@@ -31,8 +79,23 @@ app.config.from_object(Config)
 # If we add traditional form submissions in future, protect them with @csrf.protect
 csrf = CSRFProtect(app)
 
+# Compress JSON responses (settings in Config.COMPRESS_*)
+Compress(app)
+
+class OrjsonSocketIOSerializer:
+    """orjson-based replacement for the json module used by Socket.IO packets."""
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize SocketIO for real-time updates
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", json=OrjsonSocketIOSerializer)
 
 # Setup logging
 if not os.path.exists('logs'):
@@ -43,7 +106,14 @@ file_handler.setFormatter(logging.Formatter(
     '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
 ))
 file_handler.setLevel(logging.INFO)
-app.logger.addHandler(file_handler)
+
+# Write log records from a background thread so request handlers and the
+# broadcast loop never block on file I/O or log rotation
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+app.logger.addHandler(QueueHandler(log_queue))
 app.logger.setLevel(logging.INFO)
 app.logger.info('Hot Water Tank Control System startup')
 
@@ -51,13 +121,96 @@ app.logger.info('Hot Water Tank Control System startup')
 system_config = SystemConfig()
 
 # Initialize database
-db = Database('data.db')
+db = Database('data.db', synchronous=app.config['DB_SYNCHRONOUS'])
 
 # Initialize controllers
 evok_client = None
 temp_controller = None
 broadcast_thread = None
 broadcast_running = False
+last_snapshot = None
+
+# Broadcast tuning: minimum temperature change (°C) worth pushing to clients,
+# and the maximum silence (seconds) before an unchanged snapshot is re-sent.
+# The keep-alive stays below the dashboard's 30 s stale-data threshold.
+TEMPERATURE_CHANGE_THRESHOLD = 0.1
+BROADCAST_KEEPALIVE = 20
+BROADCAST_POLL_INTERVAL = 0.25
+
+# Short-lived cache of read-only API responses (dashboards poll the same queries)
+response_cache = TTLCache(maxsize=128, ttl=15)
+response_cache_lock = Lock()
+
+
+def cached_response(f):
+    """
+    Decorator caching successful JSON responses of read-only API routes.
+
+    Responses are keyed by request path and query arguments and expire
+    after the cache TTL, so identical polls skip the database entirely.
+    Browsers are told not to reuse responses without asking, so the
+    server cache is the only one in play.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        with response_cache_lock:
+            body = response_cache.get(key)
+        if body is not None:
+            response = app.response_class(body, mimetype=app.json.mimetype)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                with response_cache_lock:
+                    response_cache[key] = response.get_data()
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return decorated
+
+
+# Modification time of each static file, appended to its URL as ?v=
+static_versions = {}
+
+
+@app.url_defaults
+def add_static_version(endpoint: str, values: dict):
+    """
+    Version static file URLs with the file's modification time.
+
+    nginx serves /static with a 30 day immutable cache, so without a
+    version an updated script would keep running from the browser cache
+    against a changed API.
+    """
+    if endpoint != 'static' or 'v' in values or 'filename' not in values:
+        return
+    filename = values['filename']
+    version = static_versions.get(filename)
+    if version is None or app.debug:
+        try:
+            version = int(os.stat(os.path.join(app.static_folder, filename)).st_mtime)
+        except OSError:
+            return
+        static_versions[filename] = version
+    values['v'] = version
+
+
+# Rendered HTML of pages that only depend on static template content
+rendered_pages = {}
+
+
+def render_page(template: str) -> str:
+    """
+    Render a page template once and serve the cached HTML afterwards.
+
+    Dashboard, history and settings pages load all live data through the
+    JSON API, so their HTML is identical for every authenticated request.
+    Templates are re-rendered on each request in debug mode.
+    """
+    html = rendered_pages.get(template)
+    if html is None or app.debug:
+        html = render_template(template)
+        rendered_pages[template] = html
+    return html
 
 
 @app.route('/health')
@@ -106,7 +259,7 @@ def health_check():
 @requires_auth
 def index():
     """Main dashboard page."""
-    return render_template('dashboard.html')
+    return render_page('dashboard.html')
 
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -116,10 +269,18 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
 
+        client_id = request.remote_addr or 'unknown'
+        if login_rate_limited(client_id):
+            app.logger.warning(f'Login rate limit exceeded for {client_id}')
+            return render_template('login.html',
+                                   error='Příliš mnoho pokusů o přihlášení, zkuste to později'), 429
+
         if check_auth(username, password):
+            clear_login_failures(client_id)
             session['authenticated'] = True
             return redirect(url_for('index'))
         else:
+            record_login_failure(client_id)
             return render_template('login.html', error='Neplatné přihlašovací údaje')
 
     return render_template('login.html')
@@ -145,7 +306,7 @@ def logout():
 @requires_auth
 def history():
     """History and statistics page."""
-    return render_template('history.html')
+    return render_page('history.html')
 
 
 @app.route('/settings', methods=['GET', 'POST'])
@@ -156,7 +317,17 @@ def settings():
         # Handle settings update
         pass
 
-    return render_template('settings.html')
+    return render_page('settings.html')
+
+
+def get_tank_temperatures():
+    """
+    Return the current per-tank readings.
+
+    The controller rebuilds this mapping once per control cycle, so API
+    requests and broadcasts share it instead of re-mapping sensor IDs.
+    """
+    return temp_controller.tank_temperatures
 
 
 @app.route('/api/temperature')
@@ -164,15 +335,7 @@ def settings():
 def get_temperature():
     """API endpoint for current temperature readings."""
     if temp_controller:
-        temps = temp_controller.temperatures
-        # Convert sensor IDs to tank numbers
-        sensor_ids = list(temps.keys())
-        return jsonify({
-            'tank1': temps.get(sensor_ids[0]) if len(sensor_ids) > 0 else None,
-            'tank2': temps.get(sensor_ids[1]) if len(sensor_ids) > 1 else None,
-            'tank3': temps.get(sensor_ids[2]) if len(sensor_ids) > 2 else None,
-            'average': temp_controller.average_temperature
-        })
+        return jsonify(get_tank_temperatures())
     return jsonify({
         'tank1': None,
         'tank2': None,
@@ -181,25 +344,44 @@ def get_temperature():
     })
 
 
+def current_status(settings):
+    """
+    Combine the controller's last status snapshot with current settings.
+
+    Settings changed through the API since the last control cycle are
+    reported immediately.
+
+    Args:
+        settings: Settings snapshot
+
+    Returns:
+        Status dictionary
+    """
+    return {
+        **temp_controller.get_status(),
+        'setpoint': settings.get('setpoint'),
+        'hysteresis': settings.get('hysteresis'),
+        'manual_override': settings.get('manual_override'),
+        'heating_system_enabled': settings.get('heating_system_enabled', True),
+    }
+
+
 @app.route('/api/status')
 @requires_auth
 def get_status():
     """API endpoint for system status."""
+    settings = system_config.snapshot()
+
     if temp_controller:
-        status = temp_controller.get_status()
-        status.update({
-            'setpoint': system_config.get('setpoint'),
-            'hysteresis': system_config.get('hysteresis')
-        })
-        return jsonify(status)
+        return jsonify(current_status(settings))
 
     return jsonify({
         'heating': False,
         'pump': False,
-        'setpoint': system_config.get('setpoint', 60.0),
-        'hysteresis': system_config.get('hysteresis', 2.0),
-        'manual_override': system_config.get('manual_override', False),
-        'heating_system_enabled': system_config.get('heating_system_enabled', True)
+        'setpoint': settings.get('setpoint', 60.0),
+        'hysteresis': settings.get('hysteresis', 2.0),
+        'manual_override': settings.get('manual_override', False),
+        'heating_system_enabled': settings.get('heating_system_enabled', True)
     })
 
 
@@ -215,6 +397,39 @@ def get_settings():
     return jsonify(settings)
 
 
+# Numeric settings accepted by the settings API: (type, default, min, max, error message)
+SETTINGS_BOUNDS = {
+    'setpoint': (float, 60.0, 5, 85, 'Setpoint must be between 5-85°C'),
+    'hysteresis': (float, 2.0, 0.5, 10, 'Hysteresis must be between 0.5-10°C'),
+    'max_temperature': (float, 85.0, 60, 95, 'Max temperature must be between 60-95°C'),
+    'pump_delay': (int, 60, 0, 300, 'Pump delay must be between 0-300 seconds'),
+    'update_interval': (int, 5, 1, 60, 'Update interval must be between 1-60 seconds'),
+    'sensor_timeout': (int, 30, 5, 120, 'Sensor timeout must be between 5-120 seconds'),
+}
+
+
+def parse_settings(data, keys):
+    """
+    Convert and range-check numeric settings from a request payload.
+
+    Args:
+        data: Parsed JSON request body
+        keys: Setting names to read, checked in order
+
+    Returns:
+        Tuple of (values dict, None) or (None, error message) for the first
+        value outside its allowed range
+    """
+    values = {}
+    for key in keys:
+        convert, default, low, high, message = SETTINGS_BOUNDS[key]
+        value = convert(data.get(key, default))
+        if not (low <= value <= high):
+            return None, message
+        values[key] = value
+    return values, None
+
+
 @app.route('/api/settings/temperature', methods=['POST'])
 @requires_auth
 def save_temperature_settings():
@@ -223,27 +438,15 @@ def save_temperature_settings():
         data = request.get_json()
 
         # Validate input
-        setpoint = float(data.get('setpoint', 60.0))
-        hysteresis = float(data.get('hysteresis', 2.0))
-        max_temperature = float(data.get('max_temperature', 85.0))
-
-        if not (5 <= setpoint <= 85):
-            return jsonify({'error': 'Setpoint must be between 5-85°C'}), 400
-
-        if not (0.5 <= hysteresis <= 10):
-            return jsonify({'error': 'Hysteresis must be between 0.5-10°C'}), 400
-
-        if not (60 <= max_temperature <= 95):
-            return jsonify({'error': 'Max temperature must be between 60-95°C'}), 400
+        values, error = parse_settings(data, ('setpoint', 'hysteresis', 'max_temperature'))
+        if error:
+            return jsonify({'error': error}), 400
 
         # Update settings
-        system_config.update({
-            'setpoint': setpoint,
-            'hysteresis': hysteresis,
-            'max_temperature': max_temperature
-        })
+        system_config.update(values)
 
-        app.logger.info(f'Temperature settings updated: setpoint={setpoint}, hysteresis={hysteresis}')
+        app.logger.info(f'Temperature settings updated: setpoint={values["setpoint"]}, '
+                        f'hysteresis={values["hysteresis"]}')
         return jsonify({'success': True, 'message': 'Settings saved'})
 
     except Exception as e:
@@ -258,14 +461,13 @@ def save_pump_settings():
     try:
         data = request.get_json()
 
-        pump_delay = int(data.get('pump_delay', 60))
+        values, error = parse_settings(data, ('pump_delay',))
+        if error:
+            return jsonify({'error': error}), 400
 
-        if not (0 <= pump_delay <= 300):
-            return jsonify({'error': 'Pump delay must be between 0-300 seconds'}), 400
+        system_config.update(values)
 
-        system_config.set('pump_delay', pump_delay)
-
-        app.logger.info(f'Pump settings updated: delay={pump_delay}s')
+        app.logger.info(f'Pump settings updated: delay={values["pump_delay"]}s')
         return jsonify({'success': True, 'message': 'Settings saved'})
 
     except Exception as e:
@@ -280,21 +482,14 @@ def save_system_settings():
     try:
         data = request.get_json()
 
-        update_interval = int(data.get('update_interval', 5))
-        sensor_timeout = int(data.get('sensor_timeout', 30))
-
-        if not (1 <= update_interval <= 60):
-            return jsonify({'error': 'Update interval must be between 1-60 seconds'}), 400
+        values, error = parse_settings(data, ('update_interval', 'sensor_timeout'))
+        if error:
+            return jsonify({'error': error}), 400
 
-        if not (5 <= sensor_timeout <= 120):
-            return jsonify({'error': 'Sensor timeout must be between 5-120 seconds'}), 400
+        system_config.update(values)
 
-        system_config.update({
-            'update_interval': update_interval,
-            'sensor_timeout': sensor_timeout
-        })
-
-        app.logger.info(f'System settings updated: interval={update_interval}s, timeout={sensor_timeout}s')
+        app.logger.info(f'System settings updated: interval={values["update_interval"]}s, '
+                        f'timeout={values["sensor_timeout"]}s')
         return jsonify({'success': True, 'message': 'Settings saved'})
 
     except Exception as e:
@@ -359,20 +554,81 @@ def save_heating_system_control():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/sensors/rescan', methods=['POST'])
+@requires_auth
+def rescan_sensors():
+    """API endpoint to rediscover 1-wire sensors and refresh the cached sensor list."""
+    if not temp_controller:
+        return jsonify({'error': 'System not initialized'}), 503
+
+    try:
+        if not temp_controller.discover_sensors():
+            return jsonify({'error': 'No temperature sensors found'}), 404
+
+        app.logger.info(f'Sensors rescanned by user: {temp_controller.sensor_ids}')
+        return jsonify({
+            'success': True,
+            'sensor_ids': temp_controller.sensor_ids,
+            'sensor_count': len(temp_controller.sensor_ids)
+        })
+
+    except Exception as e:
+        app.logger.error(f'Error rescanning sensors: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
+# Integer query arguments of history endpoints: (default, min, max)
+QUERY_ARG_BOUNDS = {
+    'hours': (24, 1, 8760),
+    'interval': (5, 1, 1440),
+    'limit': (100, 1, 10000),
+    'tank': (None, 1, 3),
+}
+
+
+def parse_query_args(*keys):
+    """
+    Convert and range-check integer query arguments of the current request.
+
+    Args:
+        keys: Argument names to read
+
+    Returns:
+        Tuple of values in the order of keys (defaults for missing arguments)
+
+    Raises:
+        ValueError: If an argument is not an integer or out of range
+    """
+    values = []
+    for key in keys:
+        default, low, high = QUERY_ARG_BOUNDS[key]
+        raw = request.args.get(key)
+        if not raw:
+            values.append(default)
+            continue
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValueError(f'Parameter {key} must be an integer')
+        if not (low <= value <= high):
+            raise ValueError(f'Parameter {key} must be between {low}-{high}')
+        values.append(value)
+    return tuple(values)
+
+
 @app.route('/api/history/temperature', methods=['GET'])
 @requires_auth
+@cached_response
 def get_temperature_history():
     """API endpoint for temperature history."""
     try:
-        hours = int(request.args.get('hours', 24))
-        tank_number = request.args.get('tank')
-
-        if tank_number:
-            tank_number = int(tank_number)
+        hours, tank_number = parse_query_args('hours', 'tank')
 
         history = db.get_temperature_history(hours=hours, tank_number=tank_number)
         return jsonify({'success': True, 'data': history})
 
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
         app.logger.error(f'Error getting temperature history: {e}')
         return jsonify({'error': str(e)}), 500
@@ -380,170 +636,140 @@ def get_temperature_history():
 
 @app.route('/api/history/average', methods=['GET'])
 @requires_auth
+@cached_response
 def get_average_history():
     """API endpoint for averaged temperature history."""
     try:
-        hours = int(request.args.get('hours', 24))
-        interval = int(request.args.get('interval', 5))
+        hours, interval = parse_query_args('hours', 'interval')
 
         history = db.get_average_temperature_history(hours=hours, interval_minutes=interval)
         return jsonify({'success': True, 'data': history})
 
-    except Exception as e:
-        app.logger.error(f'Error getting average history: {e}')
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/api/history/average/range', methods=['GET'])
-@requires_auth
-def get_average_history_range():
-    """API endpoint for averaged temperature history with custom date range."""
-    try:
-        from datetime import datetime
-
-        date_from_str = request.args.get('from')
-        date_to_str = request.args.get('to')
-        interval = int(request.args.get('interval', 5))
-
-        if not date_from_str or not date_to_str:
-            return jsonify({'error': 'Missing from or to parameter'}), 400
-
-        # Parse datetime-local format (YYYY-MM-DDTHH:MM)
-        date_from = datetime.fromisoformat(date_from_str)
-        date_to = datetime.fromisoformat(date_to_str)
-
-        # Validate date range
-        if date_from >= date_to:
-            return jsonify({'error': 'Start date must be before end date'}), 400
-
-        history = db.get_average_temperature_history_range(
-            date_from=date_from,
-            date_to=date_to,
-            interval_minutes=interval
-        )
-        return jsonify({'success': True, 'data': history})
-
     except ValueError as ve:
-        app.logger.error(f'Invalid date format: {ve}')
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DDTHH:MM'}), 400
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
-        app.logger.error(f'Error getting average history by range: {e}')
+        app.logger.error(f'Error getting average history: {e}')
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/history/events', methods=['GET'])
 @requires_auth
+@cached_response
 def get_events_history():
     """API endpoint for system events."""
     try:
-        limit = int(request.args.get('limit', 100))
+        limit, = parse_query_args('limit')
         event_type = request.args.get('type')
 
         events = db.get_recent_events(limit=limit, event_type=event_type)
         return jsonify({'success': True, 'data': events})
 
-    except Exception as e:
-        app.logger.error(f'Error getting events: {e}')
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/api/history/events/range', methods=['GET'])
-@requires_auth
-def get_events_history_range():
-    """API endpoint for system events with custom date range."""
-    try:
-        from datetime import datetime
-
-        date_from_str = request.args.get('from')
-        date_to_str = request.args.get('to')
-        event_type = request.args.get('type')
-
-        if not date_from_str or not date_to_str:
-            return jsonify({'error': 'Missing from or to parameter'}), 400
-
-        # Parse datetime-local format (YYYY-MM-DDTHH:MM)
-        date_from = datetime.fromisoformat(date_from_str)
-        date_to = datetime.fromisoformat(date_to_str)
-
-        # Validate date range
-        if date_from >= date_to:
-            return jsonify({'error': 'Start date must be before end date'}), 400
-
-        events = db.get_events_range(
-            date_from=date_from,
-            date_to=date_to,
-            event_type=event_type if event_type else None
-        )
-        return jsonify({'success': True, 'data': events})
-
     except ValueError as ve:
-        app.logger.error(f'Invalid date format: {ve}')
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DDTHH:MM'}), 400
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
-        app.logger.error(f'Error getting events by range: {e}')
+        app.logger.error(f'Error getting events: {e}')
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/history/control', methods=['GET'])
 @requires_auth
+@cached_response
 def get_control_history():
     """API endpoint for control action history."""
     try:
-        hours = int(request.args.get('hours', 24))
+        hours, = parse_query_args('hours')
 
         history = db.get_control_history(hours=hours)
         return jsonify({'success': True, 'data': history})
 
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
         app.logger.error(f'Error getting control history: {e}')
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/history/control/range', methods=['GET'])
-@requires_auth
-def get_control_history_range():
-    """API endpoint for control action history with custom date range."""
-    try:
-        from datetime import datetime
+def _parse_range():
+    """
+    Read the from/to query arguments of a history range request.
+
+    Both values use the datetime-local format (YYYY-MM-DDTHH:MM).
 
-        date_from_str = request.args.get('from')
-        date_to_str = request.args.get('to')
+    Returns:
+        Tuple of (date_from, date_to)
+
+    Raises:
+        ValueError: If an argument is missing, malformed or the range is empty
+    """
+    date_from_str = request.args.get('from')
+    date_to_str = request.args.get('to')
 
-        if not date_from_str or not date_to_str:
-            return jsonify({'error': 'Missing from or to parameter'}), 400
+    if not date_from_str or not date_to_str:
+        raise ValueError('Missing from or to parameter')
 
-        # Parse datetime-local format (YYYY-MM-DDTHH:MM)
+    try:
         date_from = datetime.fromisoformat(date_from_str)
         date_to = datetime.fromisoformat(date_to_str)
+    except ValueError:
+        raise ValueError('Invalid date format. Use YYYY-MM-DDTHH:MM')
+
+    if date_from >= date_to:
+        raise ValueError('Start date must be before end date')
+
+    return date_from, date_to
+
+
+# History range queries by kind: (date_from, date_to) -> rows
+RANGE_QUERIES = {
+    'average': lambda date_from, date_to: db.get_average_temperature_history_range(
+        date_from=date_from,
+        date_to=date_to,
+        interval_minutes=parse_query_args('interval')[0]
+    ),
+    'events': lambda date_from, date_to: db.get_events_range(
+        date_from=date_from,
+        date_to=date_to,
+        event_type=request.args.get('type') or None
+    ),
+    'control': lambda date_from, date_to: db.get_control_history_range(
+        date_from=date_from,
+        date_to=date_to
+    ),
+}
+
+
+@app.route('/api/history/<kind>/range', methods=['GET'])
+@requires_auth
+def get_history_range(kind):
+    """API endpoint for average, event or control history with custom date range."""
+    query = RANGE_QUERIES.get(kind)
+    if query is None:
+        return jsonify({'error': f'Unknown history type: {kind}'}), 404
 
-        # Validate date range
-        if date_from >= date_to:
-            return jsonify({'error': 'Start date must be before end date'}), 400
-
-        history = db.get_control_history_range(
-            date_from=date_from,
-            date_to=date_to
-        )
-        return jsonify({'success': True, 'data': history})
+    try:
+        date_from, date_to = _parse_range()
+        return jsonify({'success': True, 'data': query(date_from, date_to)})
 
     except ValueError as ve:
-        app.logger.error(f'Invalid date format: {ve}')
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DDTHH:MM'}), 400
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
-        app.logger.error(f'Error getting control history by range: {e}')
+        app.logger.error(f'Error getting {kind} history by range: {e}')
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/statistics', methods=['GET'])
 @requires_auth
+@cached_response
 def get_statistics():
     """API endpoint for statistical summary."""
     try:
-        hours = int(request.args.get('hours', 24))
+        hours, = parse_query_args('hours')
 
         stats = db.get_statistics(hours=hours)
         return jsonify({'success': True, 'data': stats})
 
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
         app.logger.error(f'Error getting statistics: {e}')
         return jsonify({'error': str(e)}), 500
@@ -551,6 +777,7 @@ def get_statistics():
 
 @app.route('/api/database/stats', methods=['GET'])
 @requires_auth
+@cached_response
 def get_database_stats():
     """API endpoint for database statistics."""
     try:
@@ -569,6 +796,8 @@ def delete_database():
     """API endpoint to delete all database data. Requires super admin password."""
     try:
         deleted = db.delete_all_data()
+        with response_cache_lock:
+            response_cache.clear()
 
         app.logger.warning('Database cleared via API request by super admin')
         return jsonify({
@@ -588,6 +817,10 @@ def handle_connect():
     app.logger.info('Client connected')
     emit('status', {'message': 'Connected to server'})
 
+    # Broadcasts are only sent on change, so give new clients the current state
+    if last_snapshot is not None:
+        emit('snapshot', last_snapshot)
+
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -595,41 +828,96 @@ def handle_disconnect():
     app.logger.info('Client disconnected')
 
 
+def snapshot_changed(previous, current) -> bool:
+    """
+    Check whether a broadcast snapshot differs from the last one sent.
+
+    Temperatures count as changed only when they move by at least
+    TEMPERATURE_CHANGE_THRESHOLD; any other status field must match exactly.
+    """
+    if previous is None:
+        return True
+
+    for key, value in current['temperature'].items():
+        old_value = previous['temperature'].get(key)
+        if value is None or old_value is None:
+            if value != old_value:
+                return True
+        elif abs(value - old_value) >= TEMPERATURE_CHANGE_THRESHOLD:
+            return True
+
+    # Raw sensor values in status duplicate the temperature payload
+    ignored = ('temperatures', 'average_temperature')
+    for key, value in current['status'].items():
+        if key not in ignored and previous['status'].get(key) != value:
+            return True
+
+    return False
+
+
+def wait_for_controller_update(timeout: float) -> bool:
+    """
+    Wait until the controller signals a finished control cycle.
+
+    Polls the event with socketio.sleep() so the wait yields to the async
+    server (eventlet/gevent) instead of blocking it. The controller runs in
+    a real thread and the development entry points do not monkey-patch, so
+    a plain Event.wait() here would stall the whole event loop.
+
+    Returns:
+        True if the controller signalled, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    while not temp_controller.update_event.is_set():
+        if time.monotonic() >= deadline:
+            return False
+        socketio.sleep(BROADCAST_POLL_INTERVAL)
+    return True
+
+
 def broadcast_updates():
-    """Background thread to broadcast temperature and status updates via WebSocket."""
-    global broadcast_running
+    """
+    Background task to broadcast temperature and status updates via WebSocket.
+
+    Wakes up when the controller finishes a control cycle and only emits
+    when readings or status actually changed, with a periodic keep-alive.
+    """
+    global broadcast_running, last_snapshot
+
+    last_sent = 0.0
 
     while broadcast_running:
         try:
             if temp_controller:
+                # Wait for the control loop to publish new readings
+                wait_for_controller_update(BROADCAST_KEEPALIVE)
+                temp_controller.update_event.clear()
+
                 # Get current temperature data
-                temps = temp_controller.temperatures
-                sensor_ids = list(temps.keys())
-
-                temp_data = {
-                    'tank1': temps.get(sensor_ids[0]) if len(sensor_ids) > 0 else None,
-                    'tank2': temps.get(sensor_ids[1]) if len(sensor_ids) > 1 else None,
-                    'tank3': temps.get(sensor_ids[2]) if len(sensor_ids) > 2 else None,
-                    'average': temp_controller.average_temperature
-                }
+                temp_data = get_tank_temperatures()
 
                 # Get current status
-                status_data = temp_controller.get_status()
-                status_data.update({
-                    'setpoint': system_config.get('setpoint'),
-                    'hysteresis': system_config.get('hysteresis')
-                })
+                settings = system_config.snapshot()
+                status_data = current_status(settings)
 
-                # Broadcast to all connected clients
-                socketio.emit('temperature_update', temp_data)
-                socketio.emit('status_update', status_data)
+                snapshot = {
+                    'temperature': temp_data,
+                    'status': status_data,
+                    'ts': time.time()
+                }
 
-            # Wait before next update
-            time.sleep(system_config.get('update_interval', 5))
+                if (snapshot_changed(last_snapshot, snapshot)
+                        or snapshot['ts'] - last_sent >= BROADCAST_KEEPALIVE):
+                    # Broadcast both payloads to all connected clients in one event
+                    socketio.emit('snapshot', snapshot)
+                    last_snapshot = snapshot
+                    last_sent = snapshot['ts']
+            else:
+                socketio.sleep(system_config.snapshot().get('update_interval', 5))
 
         except Exception as e:
             app.logger.error(f'Error in broadcast thread: {e}')
-            time.sleep(5)
+            socketio.sleep(5)
 
     app.logger.info('Broadcast thread stopped')
 
@@ -660,10 +948,9 @@ def initialize_system():
         temp_controller.start()
         app.logger.info('Temperature controller started')
 
-        # Start broadcast thread
+        # Start broadcast task (green thread under eventlet/gevent)
         broadcast_running = True
-        broadcast_thread = Thread(target=broadcast_updates, daemon=True)
-        broadcast_thread.start()
+        broadcast_thread = socketio.start_background_task(broadcast_updates)
         app.logger.info('Broadcast thread started')
 
         app.logger.info('System initialization complete')
@@ -686,6 +973,14 @@ def shutdown_system():
         temp_controller.stop()
         app.logger.info('Temperature controller stopped')
 
+    # Release pooled Evok connections
+    if evok_client:
+        evok_client.close()
+
+    # Close long-lived database connections (controller has flushed its writes)
+    if db:
+        db.close()
+
     app.logger.info('System shutdown complete')
 
 
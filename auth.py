@@ -6,45 +6,103 @@ password hashing, session management, and login decorators.
 """
 
 import os
-from functools import wraps
+import hashlib
+import hmac
+import time
+from collections import deque
+from threading import Lock
+from typing import Optional
+from functools import wraps, lru_cache
+from urllib.parse import urlencode
+from cachetools import TTLCache
 from flask import session, redirect, url_for, request
 from werkzeug.security import generate_password_hash, check_password_hash
 
 
+# Password hashing method (scrypt KDF; verification uses hmac.compare_digest)
+# Format: 'scrypt' or 'scrypt:<n>:<r>:<p>' as accepted by werkzeug
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+
+# Cheaper scrypt cost (n=2**14, half the werkzeug default) for the super admin
+# hash, which is verified on every sensitive POST
+SUPER_ADMIN_HASH_METHOD = os.environ.get('SUPER_ADMIN_HASH_METHOD', 'scrypt:16384:8:1')
+
 # Default credentials (should be changed in production)
+# Set via environment variable: ADMIN_PASSWORD or ADMIN_PASSWORD_HASH
 DEFAULT_USERNAME = 'admin'
-DEFAULT_PASSWORD_HASH = generate_password_hash('admin123')
+
+
+@lru_cache(maxsize=1)
+def _default_password_hash() -> str:
+    """Return the default admin hash, deriving it on first login instead of at import."""
+    configured = os.environ.get('ADMIN_PASSWORD_HASH')
+    if configured:
+        return configured
+    return generate_password_hash(os.environ.get('ADMIN_PASSWORD', 'admin123'),
+                                  method=PASSWORD_HASH_METHOD)
+
 
 # Super admin password for sensitive operations
 # Set via environment variable: SUPER_ADMIN_PASSWORD or SUPER_ADMIN_PASSWORD_HASH
 # Default: 'superadmin123' (CHANGE IN PRODUCTION!)
-SUPER_ADMIN_PASSWORD_HASH = os.environ.get(
-    'SUPER_ADMIN_PASSWORD_HASH',
-    generate_password_hash(os.environ.get('SUPER_ADMIN_PASSWORD', 'superadmin123'))
-)
+@lru_cache(maxsize=1)
+def _super_admin_hash() -> str:
+    """Return the super admin hash, deriving it only when no hash is configured."""
+    configured = os.environ.get('SUPER_ADMIN_PASSWORD_HASH')
+    if configured:
+        return configured
+    return generate_password_hash(os.environ.get('SUPER_ADMIN_PASSWORD', 'superadmin123'),
+                                  method=SUPER_ADMIN_HASH_METHOD)
+
+
+# HMAC-SHA256 of the last super admin password that passed verification,
+# keyed with a random per-process secret so it cannot be attacked offline
+_SUPER_ADMIN_DIGEST_KEY = os.urandom(32)
+_super_admin_verified_digest: Optional[bytes] = None
 
 # In production, store credentials in environment variables or secure config
+# (None = default admin hash, derived on first use)
 CREDENTIALS = {
-    DEFAULT_USERNAME: DEFAULT_PASSWORD_HASH
+    DEFAULT_USERNAME: None
 }
 
 
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """
+    Hash of a random password, checked for unknown usernames so that a login
+    attempt takes the same time whether or not the username exists.
+    """
+    return generate_password_hash(os.urandom(16).hex(), method=PASSWORD_HASH_METHOD)
+
+
+# Login throttling: at most LOGIN_ATTEMPT_LIMIT failed attempts per client
+# address within LOGIN_ATTEMPT_WINDOW seconds, so login floods cannot keep
+# the CPU busy with password hashing. Clients expire one window after their
+# last failure and the table is capped, so it cannot grow without bound.
+LOGIN_ATTEMPT_LIMIT = 5
+LOGIN_ATTEMPT_WINDOW = 60
+LOGIN_ATTEMPT_MAX_CLIENTS = 1024
+_login_attempts = TTLCache(maxsize=LOGIN_ATTEMPT_MAX_CLIENTS, ttl=LOGIN_ATTEMPT_WINDOW)
+_login_attempts_lock = Lock()
+
+
 def hash_password(password: str) -> str:
     """
-    Hash password using bcrypt via werkzeug.security.
+    Hash password using scrypt via werkzeug.security.
 
     Args:
         password: Plain text password
 
     Returns:
-        Bcrypt password hash
+        Scrypt password hash
     """
-    return generate_password_hash(password)
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
 
 
 def check_auth(username: str, password: str) -> bool:
     """
-    Verify username and password using secure bcrypt comparison.
+    Verify username and password using constant-time hash comparison.
 
     Args:
         username: Username to check
@@ -53,10 +111,60 @@ def check_auth(username: str, password: str) -> bool:
     Returns:
         True if credentials are valid, False otherwise
     """
-    if username not in CREDENTIALS:
-        return False
+    stored_hash = CREDENTIALS.get(username)
+    if stored_hash is None and username in CREDENTIALS:
+        stored_hash = CREDENTIALS[username] = _default_password_hash()
+    valid = check_password_hash(stored_hash or _dummy_hash(), password or '')
+    return valid and stored_hash is not None
+
+
+def login_rate_limited(client_id: str) -> bool:
+    """
+    Check whether the client exceeded the failed login attempt limit.
+
+    Args:
+        client_id: Client identifier (remote address)
+
+    Returns:
+        True if the attempt must be rejected without checking credentials
+    """
+    now = time.monotonic()
+    with _login_attempts_lock:
+        _login_attempts.expire()  # Drop clients whose window has passed
+        attempts = _login_attempts.get(client_id)
+        if attempts is None:
+            return False
+        while attempts and now - attempts[0] > LOGIN_ATTEMPT_WINDOW:
+            attempts.popleft()
+        if not attempts:
+            del _login_attempts[client_id]
+            return False
+        return len(attempts) >= LOGIN_ATTEMPT_LIMIT
+
+
+def record_login_failure(client_id: str):
+    """
+    Count a failed login attempt against the client's limit.
+
+    Args:
+        client_id: Client identifier (remote address)
+    """
+    with _login_attempts_lock:
+        attempts = _login_attempts.get(client_id) or deque()
+        attempts.append(time.monotonic())
+        # Re-inserting restarts the entry's TTL from this failure
+        _login_attempts[client_id] = attempts
 
-    return check_password_hash(CREDENTIALS[username], password)
+
+def clear_login_failures(client_id: str):
+    """
+    Forget the client's failed attempts after a successful login.
+
+    Args:
+        client_id: Client identifier (remote address)
+    """
+    with _login_attempts_lock:
+        _login_attempts.pop(client_id, None)
 
 
 def requires_auth(f):
@@ -71,9 +179,9 @@ def requires_auth(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        if not session.get('authenticated'):
-            return redirect(url_for('login', next=request.url))
-        return f(*args, **kwargs)
+        if session.get('authenticated'):
+            return f(*args, **kwargs)
+        return redirect(f"{url_for('login')}?{urlencode({'next': request.url})}")
     return decorated
 
 
@@ -116,7 +224,7 @@ def change_password(username: str, old_password: str, new_password: str) -> bool
 
 def check_super_admin_auth(password: str) -> bool:
     """
-    Verify super admin password for sensitive operations using secure bcrypt comparison.
+    Verify super admin password for sensitive operations using constant-time hash comparison.
 
     Args:
         password: Plain text super admin password
@@ -124,10 +232,22 @@ def check_super_admin_auth(password: str) -> bool:
     Returns:
         True if password is valid, False otherwise
     """
+    global _super_admin_verified_digest
+
     if not password:
         return False
 
-    return check_password_hash(SUPER_ADMIN_PASSWORD_HASH, password)
+    # Repeated checks of an already verified password skip the scrypt KDF
+    digest = hmac.new(_SUPER_ADMIN_DIGEST_KEY, password.encode(), hashlib.sha256).digest()
+    verified = _super_admin_verified_digest
+    if verified is not None and hmac.compare_digest(digest, verified):
+        return True
+
+    if not check_password_hash(_super_admin_hash(), password):
+        return False
+
+    _super_admin_verified_digest = digest
+    return True
 
 
 def requires_super_admin(f):
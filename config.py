@@ -8,36 +8,22 @@ user settings persistence, and environment-specific settings.
 import os
 import sys
 import json
-from typing import Dict, Any
+import time
+import hashlib
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+
+import orjson
+
+from database import SYNCHRONOUS_LEVELS
 
 
 class Config:
     """Flask application configuration."""
 
-    # Flask settings with validation
+    # Flask settings (validated by from_env)
     SECRET_KEY = os.environ.get('SECRET_KEY')
 
-    # Validate SECRET_KEY in production
-    if not SECRET_KEY:
-        # Check if we're in development mode
-        is_dev = os.environ.get('USE_MOCK_EVOK', 'false').lower() == 'true' or \
-                 os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
-
-        if is_dev:
-            SECRET_KEY = 'dev-secret-key-change-in-production'
-            print("WARNING: Using default SECRET_KEY in development mode")
-        else:
-            print("CRITICAL: SECRET_KEY environment variable is not set in production!")
-            print("Set SECRET_KEY in .env file or environment variables")
-            sys.exit(1)
-    elif SECRET_KEY == 'dev-secret-key-change-in-production':
-        print("CRITICAL: SECRET_KEY is set to default value!")
-        print("Generate a secure key with: python -c 'import secrets; print(secrets.token_hex(32))'")
-        sys.exit(1)
-    elif len(SECRET_KEY) < 32:
-        print("CRITICAL: SECRET_KEY is too short (minimum 32 characters recommended)!")
-        sys.exit(1)
-
     # CSRF Protection (Flask-WTF)
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None  # CSRF tokens don't expire
@@ -48,6 +34,15 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
 
+    # Response compression (Flask-Compress) for large JSON history payloads
+    COMPRESS_MIMETYPES = ['application/json']
+    COMPRESS_ALGORITHM = 'gzip'
+    COMPRESS_LEVEL = 4
+    COMPRESS_MIN_SIZE = 1024
+
+    # Browser cache lifetime for static files (CSS, JS) in seconds
+    SEND_FILE_MAX_AGE_DEFAULT = 3600
+
     # Application settings
     DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
 
@@ -57,12 +52,66 @@ class Config:
     EVOK_WS_URL = f"ws://{EVOK_HOST}:{EVOK_PORT}/ws"
     EVOK_API_URL = f"http://{EVOK_HOST}:{EVOK_PORT}"
 
+    # Number of reverse proxies (nginx) in front of the app whose
+    # X-Forwarded-For entries are trusted; 0 when gunicorn faces clients
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', '0'))
+
+    # SQLite synchronous level: NORMAL may lose the last transactions on power
+    # loss but never corrupts the database in WAL mode; FULL fsyncs every commit
+    DB_SYNCHRONOUS = os.environ.get('DB_SYNCHRONOUS', 'NORMAL').upper()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Validate environment-dependent settings before the app uses them.
+
+        Exits the process if SECRET_KEY is missing, default or too short
+        outside development mode, or if DB_SYNCHRONOUS is not a valid level.
+
+        Returns:
+            The validated configuration class
+        """
+        secret_key = os.environ.get('SECRET_KEY')
+
+        if not secret_key:
+            # Check if we're in development mode
+            is_dev = os.environ.get('USE_MOCK_EVOK', 'false').lower() == 'true' or \
+                     os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
+
+            if is_dev:
+                secret_key = 'dev-secret-key-change-in-production'
+                print("WARNING: Using default SECRET_KEY in development mode")
+            else:
+                print("CRITICAL: SECRET_KEY environment variable is not set in production!")
+                print("Set SECRET_KEY in .env file or environment variables")
+                sys.exit(1)
+        elif secret_key == 'dev-secret-key-change-in-production':
+            print("CRITICAL: SECRET_KEY is set to default value!")
+            print("Generate a secure key with: python -c 'import secrets; print(secrets.token_hex(32))'")
+            sys.exit(1)
+        elif len(secret_key) < 32:
+            print("CRITICAL: SECRET_KEY is too short (minimum 32 characters recommended)!")
+            sys.exit(1)
+
+        if cls.DB_SYNCHRONOUS not in SYNCHRONOUS_LEVELS:
+            print(f"CRITICAL: DB_SYNCHRONOUS must be one of {', '.join(SYNCHRONOUS_LEVELS)}!")
+            sys.exit(1)
+
+        cls.SECRET_KEY = secret_key
+        return cls
+
 
 class SystemConfig:
     """System configuration for temperature control with in-memory caching."""
 
+    __slots__ = ('settings', '_content_digest', '_cache_fingerprint', '_last_check',
+                 '_version', '_snapshot', '_snapshot_version')
+
     CONFIG_FILE = 'config.json'
 
+    # Minimum seconds between config file mtime checks
+    CACHE_CHECK_INTERVAL = 1.0
+
     # Default settings
     DEFAULT_SETTINGS = {
         'setpoint': 60.0,           # Target temperature in °C
@@ -81,62 +130,129 @@ class SystemConfig:
 
     def __init__(self):
         """Initialize configuration with in-memory cache."""
+        self._content_digest = None  # Digest of the last parsed file content
         self.settings = self.load_settings()
-        self._cache_mtime = None  # Track file modification time
-        self._update_cache_mtime()
+        self._cache_fingerprint = None  # (mtime_ns, size) of config file
+        self._last_check = time.monotonic()  # Last fingerprint check
+        self._update_cache_fingerprint()
+        self._version = 0  # Bumped whenever settings change
+        self._snapshot = None
+        self._snapshot_version = -1
+
+    @staticmethod
+    def _digest(raw: bytes) -> bytes:
+        """Short content digest used to detect no-op rewrites of the file."""
+        return hashlib.blake2b(raw, digest_size=8).digest()
+
+    def _read_config_file(self) -> Optional[bytes]:
+        """Read raw config file content, or None if it does not exist."""
+        try:
+            with open(self.CONFIG_FILE, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _parse_settings(self, raw: Optional[bytes]) -> Dict[str, Any]:
+        """Parse raw config content and merge it with defaults."""
+        if raw is None:
+            return self.DEFAULT_SETTINGS.copy()
+        self._content_digest = self._digest(raw)
+        try:
+            loaded = orjson.loads(raw)
+            # Merge with defaults to ensure all keys exist
+            settings = self.DEFAULT_SETTINGS.copy()
+            settings.update(loaded)
+            return settings
+        except Exception as e:
+            print(f"Error loading config: {e}, using defaults")
+            return self.DEFAULT_SETTINGS.copy()
 
     def load_settings(self) -> Dict[str, Any]:
         """Load settings from configuration file."""
-        if os.path.exists(self.CONFIG_FILE):
-            try:
-                with open(self.CONFIG_FILE, 'r') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    settings = self.DEFAULT_SETTINGS.copy()
-                    settings.update(loaded)
-                    return settings
-            except Exception as e:
-                print(f"Error loading config: {e}, using defaults")
-                return self.DEFAULT_SETTINGS.copy()
-        return self.DEFAULT_SETTINGS.copy()
+        try:
+            raw = self._read_config_file()
+        except Exception as e:
+            print(f"Error loading config: {e}, using defaults")
+            return self.DEFAULT_SETTINGS.copy()
+        return self._parse_settings(raw)
 
-    def _update_cache_mtime(self):
-        """Update the cached modification time of config file."""
-        if os.path.exists(self.CONFIG_FILE):
-            self._cache_mtime = os.path.getmtime(self.CONFIG_FILE)
+    def _update_cache_fingerprint(self):
+        """Update the cached modification time and size of config file."""
+        try:
+            st = os.stat(self.CONFIG_FILE)
+            self._cache_fingerprint = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
 
     def _is_cache_valid(self) -> bool:
         """Check if cached settings are still valid (file hasn't been modified)."""
-        if not os.path.exists(self.CONFIG_FILE):
+        try:
+            st = os.stat(self.CONFIG_FILE)
+        except FileNotFoundError:
             return True  # No file = cache is valid (using defaults)
-        current_mtime = os.path.getmtime(self.CONFIG_FILE)
-        return current_mtime == self._cache_mtime
+        return (st.st_mtime_ns, st.st_size) == self._cache_fingerprint
 
     def save_settings(self) -> bool:
         """Save current settings to configuration file."""
         try:
-            with open(self.CONFIG_FILE, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-            self._update_cache_mtime()  # Update cache timestamp after save
+            # stdlib json keeps the existing 4-space on-disk format (orjson
+            # only indents by 2); saves are rare, so its speed doesn't matter
+            raw = json.dumps(self.settings, indent=4).encode()
+            with open(self.CONFIG_FILE, 'wb') as f:
+                f.write(raw)
+            self._content_digest = self._digest(raw)
+            self._update_cache_fingerprint()  # Update cache fingerprint after save
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
             return False
 
+    def _refresh(self):
+        """Reload settings if the config file was modified externally."""
+        now = time.monotonic()
+        if now - self._last_check < self.CACHE_CHECK_INTERVAL:
+            return
+        self._last_check = now
+
+        if not self._is_cache_valid():
+            self._update_cache_fingerprint()
+            try:
+                raw = self._read_config_file()
+            except Exception as e:
+                print(f"Error loading config: {e}, keeping cached settings")
+                return
+            # Touched or rewritten with identical content: keep parsed settings
+            if raw is not None and self._digest(raw) == self._content_digest:
+                return
+            self.settings = self._parse_settings(raw)
+            self._version += 1
+
     def get(self, key: str, default=None):
         """Get configuration value from cache (with automatic refresh if file changed)."""
-        # Reload if file was modified externally
-        if not self._is_cache_valid():
-            self.settings = self.load_settings()
-            self._update_cache_mtime()
+        self._refresh()
         return self.settings.get(key, default)
 
+    def snapshot(self) -> Mapping[str, Any]:
+        """
+        Get a read-only snapshot of all settings.
+
+        The snapshot is rebuilt only when settings change, so hot loops can
+        read several values with a single freshness check.
+        """
+        self._refresh()
+        if self._snapshot_version != self._version:
+            self._snapshot = MappingProxyType(self.settings.copy())
+            self._snapshot_version = self._version
+        return self._snapshot
+
     def set(self, key: str, value: Any) -> bool:
         """Set configuration value and save."""
         self.settings[key] = value
+        self._version += 1
         return self.save_settings()
 
     def update(self, updates: Dict[str, Any]) -> bool:
         """Update multiple configuration values."""
         self.settings.update(updates)
+        self._version += 1
         return self.save_settings()
@@ -7,10 +7,11 @@ hysteresis-based heating control, and circulation pump management.
 
 import logging
 import time
-import pytz
-from typing import List, Optional, Dict
-from threading import Thread, Event
-from datetime import datetime, timedelta
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from threading import Condition, Thread, Event
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 from evok_client import EvokClient
 from config import SystemConfig
@@ -19,8 +20,18 @@ from config import SystemConfig
 class TemperatureController:
     """Main temperature control logic handler."""
 
-    # CET timezone for time operations
-    CET = pytz.timezone('Europe/Prague')
+    # Seconds between database cleanups
+    CLEANUP_INTERVAL = 24 * 60 * 60
+
+    # Maximum age in seconds of a cached sensor list used on start
+    SENSOR_CACHE_MAX_AGE = 24 * 60 * 60
+
+    # Maximum queued writes committed in one transaction, keeping each short
+    DB_WRITE_BATCH_SIZE = 500
+
+    # Maximum queued writes kept while the database is unavailable (about
+    # 7 hours of 5 s cycles); beyond it the oldest readings are dropped
+    DB_QUEUE_MAX_ITEMS = 5000
 
     def __init__(self, evok_client: EvokClient, config: SystemConfig, database=None):
         """
@@ -38,25 +49,43 @@ class TemperatureController:
 
         # Sensor IDs (to be discovered)
         self.sensor_ids: List[str] = []
+        self.sensors_from_cache = False  # True until a rediscovery replaces a cached list
 
         # Current state
         self.temperatures: Dict[str, Optional[float]] = {}
         self.average_temperature: Optional[float] = None
+        self.tank_temperatures: Dict[str, Optional[float]] = self.map_tank_temperatures()
+        self.status_snapshot: Optional[Mapping[str, Any]] = None  # Set by each control cycle
         self.heating_active = False
         self.pump_active = False
-        self.pump_shutdown_time: Optional[datetime] = None
+        self.pump_shutdown_deadline: Optional[float] = None  # time.monotonic() deadline
+
+        # Sensor read thread pool, one worker per sensor (created on first read)
+        self._sensor_pool: Optional[ThreadPoolExecutor] = None
+        self._sensor_pool_size = 0
+        # Reads still running after their cycle timed out, by sensor ID
+        self._pending_reads: Dict[str, Future] = {}
+
+        # Heating decision built from the last seen settings snapshot
+        self._heating_policy: Optional[Callable[[Optional[float], bool], Optional[bool]]] = None
+        self._heating_policy_settings: Optional[Mapping[str, Any]] = None
 
         # Control thread
         self.control_thread: Optional[Thread] = None
         self.stop_event = Event()
 
-        # Database cleanup tracking
-        self.last_cleanup: Optional[datetime] = None
+        # Set after every control cycle so listeners can push fresh state
+        self.update_event = Event()
 
-    @staticmethod
-    def _get_cet_now() -> datetime:
-        """Get current time in CET/CEST timezone with automatic DST."""
-        return datetime.now(TemperatureController.CET)
+        # Write-behind queue for database logging, drained by a writer thread
+        # so SQLite commits never delay the control cycle
+        self._db_queue: deque = deque()
+        self._db_queue_cond = Condition()
+        self._db_writes_dropped = 0
+        self._db_writer_thread: Optional[Thread] = None
+
+        # Monotonic deadline of the next database cleanup (first cycle runs it)
+        self.next_cleanup: float = 0.0
 
     def discover_sensors(self) -> bool:
         """
@@ -75,11 +104,34 @@ class TemperatureController:
             if len(self.sensor_ids) < 3:
                 self.logger.warning(f"Only {len(self.sensor_ids)} of 3 expected sensors found")
 
+            # Remember the sensor list so restarts can skip discovery
+            self.config.update({
+                'cached_sensor_ids': self.sensor_ids,
+                'cached_sensor_time': time.time()
+            })
+            self.sensors_from_cache = False
             return len(self.sensor_ids) > 0
 
         self.logger.error("No temperature sensors found")
         return False
 
+    def load_cached_sensors(self) -> bool:
+        """
+        Use the sensor list saved by the last discovery if it is recent.
+
+        Returns:
+            True if cached sensor IDs were loaded, False if discovery is needed
+        """
+        sensor_ids = self.config.get('cached_sensor_ids')
+        cached_at = self.config.get('cached_sensor_time', 0)
+        if not sensor_ids or time.time() - cached_at > self.SENSOR_CACHE_MAX_AGE:
+            return False
+
+        self.sensor_ids = list(sensor_ids)
+        self.sensors_from_cache = True
+        self.logger.info(f"Using {len(self.sensor_ids)} cached temperature sensors: {self.sensor_ids}")
+        return True
+
     def read_temperatures(self) -> Dict[str, Optional[float]]:
         """
         Read temperatures from all sensors.
@@ -87,10 +139,36 @@ class TemperatureController:
         Returns:
             Dictionary of sensor ID to temperature readings
         """
+        if self._sensor_pool is None or self._sensor_pool_size < len(self.sensor_ids):
+            if self._sensor_pool is not None:
+                self._sensor_pool.shutdown(wait=False)
+            self._sensor_pool_size = max(len(self.sensor_ids), 1)
+            self._sensor_pool = ThreadPoolExecutor(max_workers=self._sensor_pool_size,
+                                                   thread_name_prefix='sensor')
+
+        # Query all sensors in parallel, each read is an HTTP round trip to Evok.
+        # A sensor whose previous read still hangs is not queried again.
+        futures = {}
+        for sensor_id in self.sensor_ids:
+            pending = self._pending_reads.get(sensor_id)
+            if pending is not None and not pending.done():
+                continue
+            futures[sensor_id] = self._sensor_pool.submit(self.evok.get_temperature, sensor_id)
+        wait(futures.values(), timeout=self.config.get('sensor_timeout', 30))
+
         temps = {}
         for sensor_id in self.sensor_ids:
-            temp = self.evok.get_temperature(sensor_id)
-            temps[sensor_id] = temp
+            future = futures.get(sensor_id)
+            if future is None:
+                self.logger.warning(f"Previous read from {sensor_id} still pending")
+                temps[sensor_id] = None
+            elif future.done():
+                self._pending_reads.pop(sensor_id, None)
+                temps[sensor_id] = future.result()
+            else:
+                self.logger.warning(f"Timeout reading temperature from {sensor_id}")
+                self._pending_reads[sensor_id] = future
+                temps[sensor_id] = None
         return temps
 
     def calculate_average_temperature(self) -> Optional[float]:
@@ -100,62 +178,123 @@ class TemperatureController:
         Returns:
             Average temperature or None if no valid readings
         """
-        valid_temps = [t for t in self.temperatures.values() if t is not None]
-        if valid_temps:
-            return sum(valid_temps) / len(valid_temps)
-        return None
-
-    def update_heating_control(self):
-        """Apply hysteresis control logic for heating."""
-        if self.config.get('manual_override'):
+        total = 0.0
+        count = 0
+        for temp in self.temperatures.values():
+            if temp is not None:
+                total += temp
+                count += 1
+        return total / count if count else None
+
+    def map_tank_temperatures(self) -> Dict[str, Optional[float]]:
+        """
+        Map current sensor readings to tank numbers.
+
+        Sensors are assigned to tanks 1-3 in discovery order.
+
+        Returns:
+            Dictionary with tank1-tank3 readings and the average
+        """
+        readings = [self.temperatures.get(sensor_id) for sensor_id in self.sensor_ids[:3]]
+        readings.extend([None] * (3 - len(readings)))
+        return {
+            'tank1': readings[0],
+            'tank2': readings[1],
+            'tank3': readings[2],
+            'average': self.average_temperature
+        }
+
+    def _build_heating_policy(self, settings: Mapping[str, Any]) -> Callable[[Optional[float], bool], Optional[bool]]:
+        """
+        Build the heating decision for a settings snapshot.
+
+        Mode and thresholds are resolved once per snapshot, so each control
+        cycle only compares the current temperature.
+
+        Args:
+            settings: Settings snapshot
+
+        Returns:
+            Function of (average_temperature, heating_active) returning the
+            heating state to apply, or None to leave the relays unchanged
+        """
+        if settings.get('manual_override'):
             # Manual mode - use manual settings
-            target_heating = self.config.get('manual_heating', False)
-            if target_heating != self.heating_active:
-                self.set_heating(target_heating)
-            return
+            manual_heating = settings.get('manual_heating', False)
+
+            def manual(average: Optional[float], heating_active: bool) -> Optional[bool]:
+                return manual_heating if manual_heating != heating_active else None
+            return manual
 
         # Check if heating system is enabled by user
-        if not self.config.get('heating_system_enabled', True):
-            # Heating system disabled by user - turn off heating if currently on
-            if self.heating_active:
-                self.logger.info("Heating system disabled by user, turning off heating")
-                self.set_heating(False)
-            return
+        if not settings.get('heating_system_enabled', True):
+            def disabled(average: Optional[float], heating_active: bool) -> Optional[bool]:
+                # Heating system disabled by user - turn off heating if currently on
+                if heating_active:
+                    self.logger.info("Heating system disabled by user, turning off heating")
+                    return False
+                return None
+            return disabled
+
+        setpoint = settings.get('setpoint', 60.0)
+        hysteresis = settings.get('hysteresis', 2.0)
+        max_temp = settings.get('max_temperature', 85.0)
+        low = setpoint - hysteresis
+        high = setpoint + hysteresis
+
+        def hysteresis_control(average: Optional[float], heating_active: bool) -> Optional[bool]:
+            if average is None:
+                self.logger.warning("No valid temperature reading, heating disabled")
+                return False
+
+            # Safety check - disable heating if temperature too high
+            if average >= max_temp:
+                self.logger.warning(f"Temperature {average}°C exceeds maximum {max_temp}°C")
+                return False
+
+            # Hysteresis control logic
+            if average < low:
+                # Temperature too low - turn on heating
+                return True if not heating_active else None
+            if average > high:
+                # Temperature too high - turn off heating
+                return False if heating_active else None
+            return None
+        return hysteresis_control
+
+    def update_heating_control(self, settings: Optional[Mapping[str, Any]] = None):
+        """
+        Apply hysteresis control logic for heating.
 
-        if self.average_temperature is None:
-            self.logger.warning("No valid temperature reading, heating disabled")
-            self.set_heating(False)
-            return
+        Args:
+            settings: Settings snapshot for this control cycle (read from config if omitted)
+        """
+        if settings is None:
+            settings = self.config.snapshot()
 
-        setpoint = self.config.get('setpoint', 60.0)
-        hysteresis = self.config.get('hysteresis', 2.0)
-        max_temp = self.config.get('max_temperature', 85.0)
+        # Snapshots are rebuilt on every settings change, so identity tells
+        # whether the cached policy is still current
+        if settings is not self._heating_policy_settings:
+            self._heating_policy = self._build_heating_policy(settings)
+            self._heating_policy_settings = settings
 
-        # Safety check - disable heating if temperature too high
-        if self.average_temperature >= max_temp:
-            self.logger.warning(f"Temperature {self.average_temperature}°C exceeds maximum {max_temp}°C")
-            self.set_heating(False)
-            return
+        target = self._heating_policy(self.average_temperature, self.heating_active)
+        if target is not None:
+            self.set_heating(target, settings)
 
-        # Hysteresis control logic
-        if self.average_temperature < (setpoint - hysteresis):
-            # Temperature too low - turn on heating
-            if not self.heating_active:
-                self.set_heating(True)
-        elif self.average_temperature > (setpoint + hysteresis):
-            # Temperature too high - turn off heating
-            if self.heating_active:
-                self.set_heating(False)
-
-    def set_heating(self, state: bool):
+    def set_heating(self, state: bool, settings: Optional[Mapping[str, Any]] = None):
         """
         Control heating unit and circulation pump.
 
         Args:
             state: True to enable heating, False to disable
+            settings: Settings snapshot for this control cycle (read from config if omitted)
         """
-        relay_heating = self.config.get('relay_heating', '1_01')
-        relay_pump = self.config.get('relay_pump', '1_02')
+        if settings is None:
+            settings = self.config.snapshot()
+
+        relay_heating = settings.get('relay_heating', '1_01')
+        relay_pump = settings.get('relay_pump', '1_02')
 
         if state:
             # Turn on heating and pump
@@ -163,57 +302,63 @@ class TemperatureController:
             self.evok.set_relay(relay_pump, True)
             self.heating_active = True
             self.pump_active = True
-            self.pump_shutdown_time = None
+            self.pump_shutdown_deadline = None
             self.logger.info("Heating and pump activated")
 
             # Log control action
-            if self.db:
-                self.db.insert_control_action(
-                    'heating_on',
-                    True,
-                    True,
-                    self.average_temperature,
-                    self.config.get('setpoint')
-                )
+            self._queue_db_write('actions', (
+                'heating_on',
+                True,
+                True,
+                self.average_temperature,
+                settings.get('setpoint')
+            ))
         else:
             # Turn off heating, schedule pump shutdown
             self.evok.set_relay(relay_heating, False)
             self.heating_active = False
 
             # Schedule pump shutdown with delay
-            pump_delay = self.config.get('pump_delay', 60)
-            self.pump_shutdown_time = self._get_cet_now() + timedelta(seconds=pump_delay)
+            pump_delay = settings.get('pump_delay', 60)
+            self.pump_shutdown_deadline = time.monotonic() + pump_delay
             self.logger.info(f"Heating deactivated, pump will stop in {pump_delay} seconds")
 
             # Log control action
-            if self.db:
-                self.db.insert_control_action(
-                    'heating_off',
-                    False,
-                    True,  # Pump still on (delayed shutdown)
-                    self.average_temperature,
-                    self.config.get('setpoint')
-                )
-
-    def update_pump_control(self):
-        """Handle pump control (manual or automatic delayed shutdown)."""
-        if self.config.get('manual_override'):
+            self._queue_db_write('actions', (
+                'heating_off',
+                False,
+                True,  # Pump still on (delayed shutdown)
+                self.average_temperature,
+                settings.get('setpoint')
+            ))
+
+    def update_pump_control(self, settings: Optional[Mapping[str, Any]] = None):
+        """
+        Handle pump control (manual or automatic delayed shutdown).
+
+        Args:
+            settings: Settings snapshot for this control cycle (read from config if omitted)
+        """
+        if settings is None:
+            settings = self.config.snapshot()
+
+        if settings.get('manual_override'):
             # Manual mode - use manual pump setting
-            target_pump = self.config.get('manual_pump', False)
+            target_pump = settings.get('manual_pump', False)
             if target_pump != self.pump_active:
-                relay_pump = self.config.get('relay_pump', '1_02')
+                relay_pump = settings.get('relay_pump', '1_02')
                 self.evok.set_relay(relay_pump, target_pump)
                 self.pump_active = target_pump
-                self.pump_shutdown_time = None
+                self.pump_shutdown_deadline = None
                 self.logger.info(f"Pump manually {'activated' if target_pump else 'deactivated'}")
             return
 
         # Automatic mode - handle delayed shutdown
-        if self.pump_shutdown_time and self._get_cet_now() >= self.pump_shutdown_time:
-            relay_pump = self.config.get('relay_pump', '1_02')
+        if self.pump_shutdown_deadline is not None and time.monotonic() >= self.pump_shutdown_deadline:
+            relay_pump = settings.get('relay_pump', '1_02')
             self.evok.set_relay(relay_pump, False)
             self.pump_active = False
-            self.pump_shutdown_time = None
+            self.pump_shutdown_deadline = None
             self.logger.info("Circulation pump deactivated")
 
     def control_loop(self):
@@ -221,27 +366,39 @@ class TemperatureController:
         self.logger.info("Control loop started")
 
         # Log startup event
-        if self.db:
-            self.db.insert_event('startup', 'Temperature controller started')
+        self._queue_db_write('events', ('startup', 'Temperature controller started', None))
 
         while not self.stop_event.is_set():
+            # Cycle start, so the wait below subtracts the time spent working
+            cycle_start = time.monotonic()
             try:
+                # Read settings once for the whole cycle
+                settings = self.config.snapshot()
+
+                # Keep database logging alive if the writer thread ever died
+                self._ensure_db_writer()
+
                 # Perform daily database cleanup (once per day)
-                if self.db:
-                    now = self._get_cet_now()
-                    if self.last_cleanup is None or (now - self.last_cleanup).days >= 1:
-                        retention_days = self.config.get('data_retention_days', 365)
-                        self.logger.info(f"Performing daily database cleanup (keeping {retention_days} days)...")
-                        try:
-                            self.db.cleanup_old_data(days_to_keep=retention_days)
-                            self.last_cleanup = now
-                            self.logger.info("Database cleanup completed successfully")
-                        except Exception as cleanup_error:
-                            self.logger.error(f"Database cleanup error: {cleanup_error}")
+                if self.db and cycle_start >= self.next_cleanup:
+                    retention_days = settings.get('data_retention_days', 365)
+                    self.logger.info(f"Performing daily database cleanup (keeping {retention_days} days)...")
+                    try:
+                        self.db.cleanup_old_data(days_to_keep=retention_days)
+                        self.next_cleanup = cycle_start + self.CLEANUP_INTERVAL
+                        self.logger.info("Database cleanup completed successfully")
+                    except Exception as cleanup_error:
+                        self.logger.error(f"Database cleanup error: {cleanup_error}")
 
                 # Read temperatures
                 self.temperatures = self.read_temperatures()
+                if self.sensors_from_cache and None in self.temperatures.values():
+                    # A cached sensor that fails to read may have been replaced, so
+                    # rediscover (a successful discovery clears sensors_from_cache)
+                    self.logger.warning("Cached sensor read failed, rediscovering")
+                    if self.discover_sensors():
+                        self.temperatures = self.read_temperatures()
                 self.average_temperature = self.calculate_average_temperature()
+                self.tank_temperatures = self.map_tank_temperatures()
 
                 # Log temperature readings to database
                 if self.db:
@@ -251,40 +408,140 @@ class TemperatureController:
                             readings.append((sensor_id, temp, idx + 1))  # Tank number 1-3
 
                     if readings:
-                        self.db.insert_multiple_readings(readings)
+                        self._queue_db_write('readings', *readings)
 
                 # Update control logic
-                self.update_heating_control()
-                self.update_pump_control()
+                self.update_heating_control(settings)
+                self.update_pump_control(settings)
+
+                # Publish status for request handlers and the broadcaster
+                self.status_snapshot = self.build_status(settings)
 
-                # Wait for next update
-                update_interval = self.config.get('update_interval', 5)
-                self.stop_event.wait(timeout=update_interval)
+                # Notify listeners (WebSocket broadcaster) about new state
+                self.update_event.set()
+
+                # Wait for next update (fixed cadence regardless of cycle duration)
+                update_interval = settings.get('update_interval', 5)
+                self.stop_event.wait(timeout=max(0.0, cycle_start + update_interval - time.monotonic()))
 
             except Exception as e:
                 self.logger.error(f"Error in control loop: {e}")
-                if self.db:
-                    self.db.insert_event('error', f'Control loop error: {str(e)}')
+                self._queue_db_write('events', ('error', f'Control loop error: {str(e)}', None))
                 time.sleep(5)
 
         # Log shutdown event
-        if self.db:
-            self.db.insert_event('shutdown', 'Temperature controller stopped')
+        self._queue_db_write('events', ('shutdown', 'Temperature controller stopped', None))
 
         self.logger.info("Control loop stopped")
 
+    def _queue_db_write(self, table: str, *rows: Tuple):
+        """
+        Queue rows for the database writer thread.
+
+        Args:
+            table: Batch name ('readings', 'events' or 'actions')
+            rows: Row tuples as accepted by Database.insert_batch()
+        """
+        if not self.db:
+            return
+        with self._db_queue_cond:
+            if len(self._db_queue) >= self.DB_QUEUE_MAX_ITEMS:
+                self._drop_oldest_db_write()
+            self._db_queue.append((table, rows))
+            self._db_queue_cond.notify()
+
+    def _drop_oldest_db_write(self):
+        """Drop the oldest queued readings, or the oldest entry if none are queued."""
+        for index, item in enumerate(self._db_queue):
+            if item is not None and item[0] == 'readings':
+                del self._db_queue[index]
+                break
+        else:
+            self._db_queue.popleft()
+
+        self._db_writes_dropped += 1
+        if self._db_writes_dropped % 100 == 1:
+            self.logger.warning(f"Database write queue full, {self._db_writes_dropped} entries dropped")
+
+    def _db_writer_loop(self):
+        """Write queued rows to the database, one transaction per drained batch."""
+        running = True
+        while running:
+            with self._db_queue_cond:
+                while not self._db_queue:
+                    self._db_queue_cond.wait()
+                count = min(len(self._db_queue), self.DB_WRITE_BATCH_SIZE)
+                items = [self._db_queue.popleft() for _ in range(count)]
+
+            batch = {'readings': [], 'events': [], 'actions': []}
+            for item in items:
+                if item is None:  # Stop sentinel, finish the current batch first
+                    running = False
+                    continue
+                table, rows = item
+                batch[table].extend(rows)
+
+            if any(batch.values()):
+                self._write_db_batch(batch)
+
+    def _write_db_batch(self, batch: Dict[str, List[Tuple]]):
+        """
+        Commit a drained batch, falling back to one transaction per table.
+
+        A row that fails (e.g. a constraint violation) then only loses the
+        rows of its own table, and rows are retried one by one so the bad
+        ones are the only ones dropped.
+
+        Args:
+            batch: Row lists by batch name, as accepted by Database.insert_batch()
+        """
+        try:
+            self.db.insert_batch(**batch)
+            return
+        except Exception as e:
+            self.logger.error(f"Database batch write failed, retrying per table: {e}")
+
+        for table, rows in batch.items():
+            if not rows:
+                continue
+            try:
+                self.db.insert_batch(**{table: rows})
+                continue
+            except Exception:
+                pass
+
+            failed = 0
+            last_error = None
+            for row in rows:
+                try:
+                    self.db.insert_batch(**{table: [row]})
+                except Exception as e:
+                    failed += 1
+                    last_error = e
+            if failed:
+                self.logger.error(f"Dropped {failed} of {len(rows)} {table} rows: {last_error}")
+
+    def _ensure_db_writer(self):
+        """Start the database writer thread if it is not running."""
+        if self.db and not (self._db_writer_thread and self._db_writer_thread.is_alive()):
+            if self._db_writer_thread is not None:
+                self.logger.error("Database writer thread died, restarting")
+            self._db_writer_thread = Thread(target=self._db_writer_loop, daemon=True)
+            self._db_writer_thread.start()
+
     def start(self):
         """Start the control loop."""
         if self.control_thread and self.control_thread.is_alive():
             self.logger.warning("Control loop already running")
             return
 
-        # Discover sensors first
-        if not self.discover_sensors():
+        # Use recently discovered sensors, otherwise discover them
+        if not self.load_cached_sensors() and not self.discover_sensors():
             self.logger.error("No temperature sensors found")
             return
 
         self.stop_event.clear()
+        self._ensure_db_writer()
         self.control_thread = Thread(target=self.control_loop, daemon=True)
         self.control_thread.start()
         self.logger.info("Temperature controller started")
@@ -294,22 +551,53 @@ class TemperatureController:
         self.stop_event.set()
         if self.control_thread:
             self.control_thread.join(timeout=10)
+
+        # Flush pending database writes after the loop logged its shutdown
+        if self._db_writer_thread:
+            with self._db_queue_cond:
+                self._db_queue.append(None)
+                self._db_queue_cond.notify()
+            self._db_writer_thread.join(timeout=10)
+            self._db_writer_thread = None
+
+        if self._sensor_pool:
+            self._sensor_pool.shutdown(wait=False)
+            self._sensor_pool = None
+            self._pending_reads.clear()
         self.logger.info("Temperature controller stopped")
 
-    def get_status(self) -> Dict:
+    def build_status(self, settings: Mapping[str, Any]) -> Mapping[str, Any]:
         """
-        Get current system status.
+        Build a read-only status snapshot.
+
+        Args:
+            settings: Settings snapshot to report
 
         Returns:
-            Dictionary containing current system state
+            Read-only mapping containing current system state
         """
-        return {
+        return MappingProxyType({
             'temperatures': self.temperatures,
             'average_temperature': self.average_temperature,
             'heating': self.heating_active,
             'pump': self.pump_active,
-            'setpoint': self.config.get('setpoint'),
-            'hysteresis': self.config.get('hysteresis'),
-            'manual_override': self.config.get('manual_override'),
-            'heating_system_enabled': self.config.get('heating_system_enabled', True),
-        }
+            'setpoint': settings.get('setpoint'),
+            'hysteresis': settings.get('hysteresis'),
+            'manual_override': settings.get('manual_override'),
+            'heating_system_enabled': settings.get('heating_system_enabled', True),
+        })
+
+    def get_status(self) -> Mapping[str, Any]:
+        """
+        Get current system status.
+
+        Returns the snapshot published by the last control cycle, so
+        request handlers do not touch the configuration.
+
+        Returns:
+            Read-only mapping containing current system state
+        """
+        status = self.status_snapshot
+        if status is None:
+            status = self.build_status(self.config.snapshot())
+        return status
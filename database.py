@@ -5,122 +5,411 @@ This module handles SQLite database operations for storing and retrieving
 temperature readings, system events, and control actions.
 """
 
+import os
 import sqlite3
 import logging
-import pytz
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+import queue
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 from contextlib import contextmanager
+from threading import Lock
+from zoneinfo import ZoneInfo
+
+
+# Local timezone of the installation, used for API timestamps and date ranges
+CET = ZoneInfo('Europe/Prague')
+
+# Insert statements shared by single-row and batch writers. sqlite3 caches
+# compiled statements per connection keyed by SQL text, so every writer
+# must use the identical string to reuse the prepared statement.
+INSERT_READING_SQL = (
+    'INSERT INTO temperature_readings (sensor_id, temperature, tank_number) '
+    'VALUES (?, ?, ?)'
+)
+INSERT_EVENT_SQL = (
+    'INSERT INTO system_events (event_type, description, data) '
+    'VALUES (?, ?, ?)'
+)
+INSERT_ACTION_SQL = (
+    'INSERT INTO control_actions '
+    '(action_type, heating_state, pump_state, average_temperature, setpoint) '
+    'VALUES (?, ?, ?, ?, ?)'
+)
+
+# STRICT tables (SQLite 3.37+) enforce the declared column types instead of
+# storing whatever value is bound; older libraries get ordinary tables
+STRICT_TABLES = sqlite3.sqlite_version_info >= (3, 37, 0)
+TABLE_OPTIONS = ' STRICT' if STRICT_TABLES else ''
+ROLLUP_TABLE_OPTIONS = ' WITHOUT ROWID, STRICT' if STRICT_TABLES else ' WITHOUT ROWID'
+
+# Accepted values of the synchronous constructor argument
+SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL')
+
+# PRAGMA auto_vacuum value for INCREMENTAL mode
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Non-timestamp columns of each table, used when migrating DATETIME timestamps
+TIMESTAMP_COLUMNS = {
+    'temperature_readings': 'sensor_id, temperature, tank_number',
+    'system_events': 'event_type, description, data',
+    'control_actions': 'action_type, heating_state, pump_state, average_temperature, setpoint',
+}
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    """
+    Fetch the remaining rows of a query as dictionaries keyed by column name.
+
+    Reader connections return plain tuples, so the column names are looked up
+    once per query instead of going through an sqlite3.Row for every row.
+
+    Args:
+        cursor: Cursor with an executed query
+
+    Returns:
+        List of row dictionaries
+    """
+    columns = tuple(col[0] for col in cursor.description)
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _fetch_columns(cursor: sqlite3.Cursor) -> Dict[str, List]:
+    """
+    Fetch the remaining rows of a query as one list per column.
+
+    Chart consumers want parallel arrays, and the JSON payload no longer
+    repeats every key for every row.
+
+    Args:
+        cursor: Cursor with an executed query
+
+    Returns:
+        Dictionary mapping column name to the list of its values
+    """
+    columns = [col[0] for col in cursor.description]
+    rows = cursor.fetchall()
+    if not rows:
+        return {column: [] for column in columns}
+    return dict(zip(columns, map(list, zip(*rows))))
 
 
 class Database:
     """SQLite database handler for historical data."""
 
-    def __init__(self, db_path: str = 'data.db'):
+    # Maximum number of idle read-only connections kept open
+    READER_POOL_SIZE = min(os.cpu_count() or 1, 8)
+
+    # Prepared statements cached per connection (sqlite3 default is 128)
+    STATEMENT_CACHE_SIZE = 256
+
+    # Rows materialised per executemany call in bulk_insert_readings
+    BULK_INSERT_CHUNK_SIZE = 10000
+
+    # Rows removed per retention-cleanup transaction, and the pause between them
+    DELETE_BATCH_SIZE = 5000
+    DELETE_BATCH_PAUSE = 0.01
+
+    # Rows sampled per index by ANALYZE
+    ANALYSIS_LIMIT = 1000
+
+    # Page size for newly created database files
+    PAGE_SIZE = 8192
+
+    # Free pages released per retention cleanup (8 MB with 8 KB pages), and
+    # the free-list size below which cleanup leaves them for reuse
+    INCREMENTAL_VACUUM_PAGES = 1000
+    VACUUM_FREE_PAGE_THRESHOLD = 128
+
+    def __init__(self, db_path: str = 'data.db', synchronous: str = 'NORMAL'):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
+            synchronous: SQLite synchronous level ('OFF', 'NORMAL' or 'FULL');
+                         with WAL, NORMAL can only lose the last commits on power loss
+
+        Raises:
+            ValueError: If synchronous is not a supported level
         """
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Invalid synchronous level: {synchronous}")
+
         self.db_path = db_path
+        self.synchronous = synchronous
         self.logger = logging.getLogger(__name__)
+
+        # Long-lived connections: one writer plus a small pool of readers
+        self._write_lock = Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers: queue.LifoQueue = queue.LifoQueue(maxsize=self.READER_POOL_SIZE)
+
         self._init_database()
 
     @staticmethod
     def _get_cet_now() -> datetime:
         """Get current time in CET/CEST timezone with automatic DST."""
-        cet = pytz.timezone('Europe/Prague')
-        return datetime.now(cet)
+        return datetime.now(CET)
 
     @staticmethod
-    def _cet_to_utc(dt: datetime) -> datetime:
-        """Convert CET/CEST datetime to UTC for database queries."""
+    def _cet_to_epoch(dt: datetime) -> int:
+        """Convert CET/CEST datetime to unix seconds, the stored timestamp format."""
         if dt.tzinfo is None:
             # Assume it's CET if naive
-            cet = pytz.timezone('Europe/Prague')
-            dt = cet.localize(dt)
-        return dt.astimezone(pytz.utc).replace(tzinfo=None)
+            dt = dt.replace(tzinfo=CET)
+        return int(dt.timestamp())
 
-    @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections with performance optimizations."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
-        # Performance optimizations
-        conn.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging for better concurrency
-        conn.execute('PRAGMA synchronous=NORMAL')  # Balance safety vs performance
-        conn.execute('PRAGMA cache_size=-64000')  # 64MB cache (negative = KB)
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Open a database connection with performance optimizations.
+
+        Args:
+            read_only: Open the file in read-only mode (for the reader pool)
+
+        Returns:
+            Configured SQLite connection
+        """
+        # Connections are shared between threads: the writer is guarded by
+        # _write_lock, readers are handed out by the pool one at a time
+        # isolation_level=None disables the implicit transactions of the sqlite3
+        # module; writes use BEGIN IMMEDIATE so they never upgrade a read lock
+        if read_only:
+            target = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+        else:
+            target = self.db_path
+        conn = sqlite3.connect(target, uri=read_only, check_same_thread=False,
+                               isolation_level=None,
+                               cached_statements=self.STATEMENT_CACHE_SIZE)
+        if read_only:
+            conn.execute('PRAGMA query_only=1')
+
+        # Per-connection performance settings (WAL mode is persistent, set in _init_database)
+        conn.execute('PRAGMA busy_timeout=5000')  # Wait up to 5 s for a concurrent writer
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')  # Durability vs fsync cost
+        conn.execute('PRAGMA cache_size=-20000')  # 20MB cache (negative = KB)
         conn.execute('PRAGMA temp_store=MEMORY')  # Store temp tables in memory
         conn.execute('PRAGMA mmap_size=268435456')  # 256MB memory-mapped I/O
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Return the shared writer connection, opening it on first use (caller holds _write_lock)."""
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
 
+    @contextmanager
+    def _get_connection(self):
+        """Context manager for a write transaction on the shared writer connection."""
+        with self._write_lock:
+            conn = self._get_writer()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except Exception as e:
+                conn.execute('ROLLBACK')
+                self.logger.error(f"Database error: {e}")
+                raise
+
+    @contextmanager
+    def _get_reader(self, snapshot: bool = False):
+        """
+        Context manager for a pooled read-only connection.
+
+        Args:
+            snapshot: Run the queries in one deferred transaction so they all
+                      see the same WAL snapshot (never blocks the writer)
+        """
         try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            self.logger.error(f"Database error: {e}")
-            raise
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+
+        try:
+            if snapshot:
+                conn.execute('BEGIN DEFERRED')
+                try:
+                    yield conn
+                finally:
+                    conn.execute('COMMIT')
+            else:
+                yield conn
         finally:
-            conn.close()
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _incremental_vacuum(self, pages: Optional[int] = None):
+        """
+        Return free pages to the filesystem without rewriting the database.
+
+        Args:
+            pages: Maximum number of pages to release (None releases all)
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            # PRAGMA arguments cannot be bound; the page count is an int we control.
+            # executescript steps the pragma to completion, execute() frees one page.
+            limit = '' if pages is None else f'({int(pages)})'
+            conn.executescript(f'PRAGMA incremental_vacuum{limit};')
+
+    def _checkpoint(self):
+        """
+        Copy the WAL into the database file and truncate it.
+
+        After a large delete the WAL holds every freed and rewritten page;
+        truncating it returns that space to the filesystem. Readers inside a
+        transaction keep the checkpoint from completing, which is harmless:
+        the next one picks up where it stopped.
+        """
+        with self._write_lock:
+            busy, wal_pages, checkpointed = self._get_writer().execute(
+                'PRAGMA wal_checkpoint(TRUNCATE)'
+            ).fetchone()
+        if busy:
+            self.logger.warning(f"WAL checkpoint incomplete ({checkpointed}/{wal_pages} pages)")
+
+    def _analyze(self):
+        """
+        Refresh the planner statistics in sqlite_stat1.
+
+        With statistics the planner can tell that the covering tank index
+        beats the timestamp index for tank-filtered queries. analysis_limit
+        samples each index, so this stays cheap on a large database.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            conn.execute(f'PRAGMA analysis_limit={self.ANALYSIS_LIMIT}')
+            conn.execute('ANALYZE')
+
+    def full_vacuum(self):
+        """
+        Rebuild the whole database file to defragment it.
+
+        Rewrites every page and blocks writers while it runs, so it is meant
+        for offline maintenance; routine cleanup uses incremental vacuum.
+        Also converts files created without incremental auto-vacuum.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('VACUUM')
+        self.logger.info("Database fully vacuumed")
+
+    def close(self):
+        """Close the writer and all pooled reader connections."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
 
     def _init_database(self):
         """Initialize database schema."""
+        # File-level settings are persistent and must be applied outside a transaction
+        with self._write_lock:
+            conn = self._get_writer()
+
+            # Larger pages halve the page reads of history range scans. Only
+            # takes effect on a new file or the VACUUM below (not once in WAL).
+            conn.execute(f'PRAGMA page_size={self.PAGE_SIZE}')
+
+            # Let cleanup release free pages in bounded steps instead of a full
+            # VACUUM. A new file takes the setting directly; an existing one only
+            # through a VACUUM, which rewrites the whole file and is left to
+            # full_vacuum() rather than delaying every start-up.
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                if conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()[0]:
+                    self.logger.warning(
+                        'Database does not use incremental auto-vacuum; run full_vacuum() '
+                        'during maintenance to convert it'
+                    )
+
+            # Write-Ahead Logging for concurrent readers
+            conn.execute('PRAGMA journal_mode=WAL')
+
+            # SQLite silently caps mmap_size at the compile-time limit
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            mmap_size = conn.execute('PRAGMA mmap_size').fetchone()[0]
+            self.logger.info(f"Database page size {page_size} B, memory map {mmap_size // 1048576} MB")
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # Tables created before timestamps were stored as unix seconds
+            legacy_tables = self._rename_legacy_tables(cursor)
+
             # Temperature readings table
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE TABLE IF NOT EXISTS temperature_readings (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     sensor_id TEXT NOT NULL,
                     temperature REAL NOT NULL,
                     tank_number INTEGER
-                )
+                ){TABLE_OPTIONS}
             ''')
 
             # System events table
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE TABLE IF NOT EXISTS system_events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     event_type TEXT NOT NULL,
                     description TEXT,
                     data TEXT
-                )
+                ){TABLE_OPTIONS}
             ''')
 
             # Control actions table
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE TABLE IF NOT EXISTS control_actions (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     action_type TEXT NOT NULL,
-                    heating_state BOOLEAN,
-                    pump_state BOOLEAN,
+                    heating_state INTEGER NOT NULL CHECK (heating_state IN (0, 1)),
+                    pump_state INTEGER NOT NULL CHECK (pump_state IN (0, 1)),
                     average_temperature REAL,
                     setpoint REAL
-                )
+                ){TABLE_OPTIONS}
             ''')
 
-            # Create indices for better query performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_temp_timestamp
-                ON temperature_readings(timestamp)
-            ''')
+            if legacy_tables:
+                self._migrate_legacy_tables(cursor, legacy_tables)
+
+            self._init_rollup(cursor)
 
+            # Create indices for better query performance. The timestamp indices
+            # carry every selected column so history range scans are answered
+            # from the index alone (the id is the rowid, stored in every index).
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_temp_timestamp_tank
-                ON temperature_readings(timestamp, tank_number)
+                CREATE INDEX IF NOT EXISTS idx_temp_timestamp_covering
+                ON temperature_readings(timestamp, sensor_id, temperature, tank_number)
             ''')
 
+            # Serves the tank-filtered history branch (seek on tank, range on time)
+            # and the per-tank statistics
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_temp_tank_timestamp
-                ON temperature_readings(tank_number, timestamp)
+                CREATE INDEX IF NOT EXISTS idx_temp_tank_timestamp_covering
+                ON temperature_readings(tank_number, timestamp, sensor_id, temperature)
             ''')
 
+            # Superseded indices: (timestamp, tank_number) was never chosen, the
+            # narrow timestamp-only indices are replaced by the covering ones
+            for index in ('idx_temp_timestamp_tank', 'idx_temp_timestamp',
+                          'idx_temp_tank_timestamp', 'idx_actions_timestamp'):
+                cursor.execute(f'DROP INDEX IF EXISTS {index}')
+
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_events_timestamp
                 ON system_events(timestamp)
@@ -132,12 +421,104 @@ class Database:
             ''')
 
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_actions_timestamp
-                ON control_actions(timestamp)
+                CREATE INDEX IF NOT EXISTS idx_actions_timestamp_covering
+                ON control_actions(timestamp, action_type, heating_state, pump_state,
+                                   average_temperature, setpoint)
             ''')
 
             self.logger.info('Database schema initialized with performance indices')
 
+        self._analyze()
+
+    def _init_rollup(self, cursor: sqlite3.Cursor):
+        """
+        Create the per-minute temperature rollup and the trigger that maintains it.
+
+        Averaged history is served from the rollup instead of re-aggregating
+        raw readings. Every supported interval is a whole number of minutes,
+        so minute buckets can be regrouped exactly. Readings without a tank
+        are stored under tank_number 0 so the primary key stays unique.
+
+        Args:
+            cursor: Cursor inside the schema transaction
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'temperature_rollup'"
+        ).fetchone()
+
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS temperature_rollup (
+                bucket INTEGER NOT NULL,
+                tank_number INTEGER NOT NULL,
+                temperature_sum REAL NOT NULL,
+                reading_count INTEGER NOT NULL,
+                PRIMARY KEY (bucket, tank_number)
+            ){ROLLUP_TABLE_OPTIONS}
+        ''')
+
+        if not exists:
+            # Backfill from readings stored before the rollup existed
+            cursor.execute('''
+                INSERT INTO temperature_rollup (bucket, tank_number, temperature_sum, reading_count)
+                SELECT (timestamp / 60) * 60, IFNULL(tank_number, 0), SUM(temperature), COUNT(*)
+                FROM temperature_readings
+                GROUP BY 1, 2
+            ''')
+            self.logger.info(f"Temperature rollup created from {cursor.rowcount} buckets")
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_temperature_rollup
+            AFTER INSERT ON temperature_readings
+            BEGIN
+                INSERT INTO temperature_rollup (bucket, tank_number, temperature_sum, reading_count)
+                VALUES ((NEW.timestamp / 60) * 60, IFNULL(NEW.tank_number, 0), NEW.temperature, 1)
+                ON CONFLICT (bucket, tank_number) DO UPDATE SET
+                    temperature_sum = temperature_sum + excluded.temperature_sum,
+                    reading_count = reading_count + 1;
+            END
+        ''')
+
+    def _rename_legacy_tables(self, cursor: sqlite3.Cursor) -> List[str]:
+        """
+        Move aside tables whose timestamp column still holds DATETIME text.
+
+        Args:
+            cursor: Cursor inside the schema transaction
+
+        Returns:
+            Names of the tables that need their rows migrated
+        """
+        legacy_tables = []
+        for table in TIMESTAMP_COLUMNS:
+            # table_info rows: (cid, name, type, notnull, dflt_value, pk)
+            columns = cursor.execute(f'PRAGMA table_info({table})').fetchall()
+            if any(name == 'timestamp' and col_type.upper() == 'DATETIME'
+                   for _, name, col_type, *_ in columns):
+                cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+                legacy_tables.append(table)
+        return legacy_tables
+
+    def _migrate_legacy_tables(self, cursor: sqlite3.Cursor, tables: List[str]):
+        """
+        Copy rows from renamed legacy tables, converting timestamps to unix seconds.
+
+        Args:
+            cursor: Cursor inside the schema transaction
+            tables: Table names returned by _rename_legacy_tables
+        """
+        for table in tables:
+            columns = TIMESTAMP_COLUMNS[table]
+            cursor.execute(f'''
+                INSERT INTO {table} (id, timestamp, {columns})
+                SELECT id, IFNULL(CAST(strftime('%s', timestamp) AS INTEGER), 0), {columns}
+                FROM {table}_legacy
+            ''')
+            migrated = cursor.rowcount
+            # Dropping the legacy table also drops its indices, so they are
+            # recreated on the new table below
+            cursor.execute(f'DROP TABLE {table}_legacy')
+            self.logger.info(f"Migrated {migrated} {table} rows to integer timestamps")
+
     def insert_temperature_reading(self, sensor_id: str, temperature: float,
                                    tank_number: Optional[int] = None):
         """
@@ -149,13 +530,7 @@ class Database:
             tank_number: Tank number (1-3) or None
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO temperature_readings (sensor_id, temperature, tank_number)
-                    VALUES (?, ?, ?)
-                ''', (sensor_id, temperature, tank_number))
-
+            self.insert_batch(readings=[(sensor_id, temperature, tank_number)])
         except Exception as e:
             self.logger.error(f"Error inserting temperature reading: {e}")
 
@@ -167,15 +542,74 @@ class Database:
             readings: List of (sensor_id, temperature, tank_number) tuples
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.executemany('''
-                    INSERT INTO temperature_readings (sensor_id, temperature, tank_number)
-                    VALUES (?, ?, ?)
-                ''', readings)
-
+            self.insert_batch(readings=readings)
         except Exception as e:
-            self.logger.error(f"Error inserting multiple readings: {e}")
+            self.logger.error(f"Error inserting temperature readings: {e}")
+
+    def bulk_insert_readings(self, readings: Iterable[Tuple[str, float, Optional[int]]]) -> int:
+        """
+        Stream a large number of temperature readings into the database.
+
+        Intended for backfills and imports. Rows are consumed in chunks so a
+        generator keeps memory flat, and the whole load is one transaction
+        with fsync disabled until it commits.
+
+        Args:
+            readings: Iterable of (sensor_id, temperature, tank_number) tuples
+
+        Returns:
+            Number of readings inserted
+        """
+        readings = iter(readings)
+        inserted = 0
+
+        with self._write_lock:
+            conn = self._get_writer()
+            # Stay in WAL so dashboard readers are not locked out; only skip fsync
+            conn.execute('PRAGMA synchronous=OFF')
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    while True:
+                        chunk = list(islice(readings, self.BULK_INSERT_CHUNK_SIZE))
+                        if not chunk:
+                            break
+                        conn.executemany(INSERT_READING_SQL, chunk)
+                        inserted += len(chunk)
+                    conn.execute('COMMIT')
+                except Exception as e:
+                    conn.execute('ROLLBACK')
+                    self.logger.error(f"Error bulk inserting readings: {e}")
+                    raise
+            finally:
+                conn.execute(f'PRAGMA synchronous={self.synchronous}')
+
+        self.logger.info(f"Bulk inserted {inserted} temperature readings")
+        return inserted
+
+    def insert_batch(self, readings: List[Tuple[str, float, Optional[int]]] = (),
+                     events: List[Tuple[str, Optional[str], Optional[str]]] = (),
+                     actions: List[Tuple[str, bool, bool, Optional[float], Optional[float]]] = ()):
+        """
+        Insert readings, events and control actions in a single transaction.
+
+        Args:
+            readings: List of (sensor_id, temperature, tank_number) tuples
+            events: List of (event_type, description, data) tuples
+            actions: List of (action_type, heating_state, pump_state,
+                     average_temperature, setpoint) tuples
+
+        Raises:
+            sqlite3.Error: If the transaction fails (nothing is inserted)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if readings:
+                cursor.executemany(INSERT_READING_SQL, readings)
+            if events:
+                cursor.executemany(INSERT_EVENT_SQL, events)
+            if actions:
+                cursor.executemany(INSERT_ACTION_SQL, actions)
 
     def insert_event(self, event_type: str, description: str = None, data: str = None):
         """
@@ -187,13 +621,7 @@ class Database:
             data: Additional data (JSON string)
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO system_events (event_type, description, data)
-                    VALUES (?, ?, ?)
-                ''', (event_type, description, data))
-
+            self.insert_batch(events=[(event_type, description, data)])
         except Exception as e:
             self.logger.error(f"Error inserting event: {e}")
 
@@ -211,18 +639,12 @@ class Database:
             setpoint: Temperature setpoint at time of action
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO control_actions
-                    (action_type, heating_state, pump_state, average_temperature, setpoint)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (action_type, heating_state, pump_state, average_temperature, setpoint))
-
+            self.insert_batch(actions=[(action_type, heating_state, pump_state,
+                                        average_temperature, setpoint)])
         except Exception as e:
             self.logger.error(f"Error inserting control action: {e}")
 
-    def get_temperature_history(self, hours: int = 24, tank_number: Optional[int] = None) -> List[Dict]:
+    def get_temperature_history(self, hours: int = 24, tank_number: Optional[int] = None) -> Dict[str, List]:
         """
         Get temperature history for specified time period.
 
@@ -231,35 +653,40 @@ class Database:
             tank_number: Filter by tank number (None for all tanks)
 
         Returns:
-            List of temperature reading dictionaries
+            Dictionary of column lists (id, timestamp, sensor_id, temperature, tank_number)
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
-                cutoff_time = self._cet_to_utc(self._get_cet_now() - timedelta(hours=hours))
+                # Window start is computed by SQLite from a modifier such as '-24 hours'
+                window = f'-{int(hours)} hours'
 
                 if tank_number is not None:
                     cursor.execute('''
-                        SELECT * FROM temperature_readings
-                        WHERE timestamp >= ? AND tank_number = ?
-                        ORDER BY timestamp ASC
-                    ''', (cutoff_time, tank_number))
+                        SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, sensor_id, temperature, tank_number
+                        FROM temperature_readings
+                        WHERE timestamp >= CAST(strftime('%s', 'now', ?) AS INTEGER) AND tank_number = ?
+                        ORDER BY temperature_readings.timestamp ASC
+                    ''', (window, tank_number))
                 else:
                     cursor.execute('''
-                        SELECT * FROM temperature_readings
-                        WHERE timestamp >= ?
-                        ORDER BY timestamp ASC
-                    ''', (cutoff_time,))
+                        SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, sensor_id, temperature, tank_number
+                        FROM temperature_readings
+                        WHERE timestamp >= CAST(strftime('%s', 'now', ?) AS INTEGER)
+                        ORDER BY temperature_readings.timestamp ASC
+                    ''', (window,))
 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return _fetch_columns(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting temperature history: {e}")
-            return []
+            raise
 
-    def get_average_temperature_history(self, hours: int = 24, interval_minutes: int = 5) -> List[Dict]:
+    def get_average_temperature_history(self, hours: int = 24, interval_minutes: int = 5) -> Dict[str, List]:
         """
         Get average temperature history aggregated by time interval.
 
@@ -268,39 +695,46 @@ class Database:
             interval_minutes: Grouping interval in minutes
 
         Returns:
-            List of averaged temperature readings with separate tank values
+            Dictionary of column lists (timestamp, tank1, tank2, tank3, average)
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
-                cutoff_time = self._cet_to_utc(self._get_cet_now() - timedelta(hours=hours))
+                # Window start is computed by SQLite from a modifier such as '-24 hours'
+                window = f'-{int(hours)} hours'
+                # Interval is bound, not formatted in, so the statement text stays cacheable
+                bucket_seconds = int(interval_minutes) * 60
 
-                cursor.execute(f'''
+                # Regroup minute buckets from the rollup; the bucket holding the
+                # window start is included
+                cursor.execute('''
                     SELECT
-                        datetime(
-                            (strftime('%s', timestamp) / ({interval_minutes} * 60)) * ({interval_minutes} * 60),
-                            'unixepoch'
-                        ) as timestamp,
-                        AVG(CASE WHEN tank_number = 1 THEN temperature END) as tank1,
-                        AVG(CASE WHEN tank_number = 2 THEN temperature END) as tank2,
-                        AVG(CASE WHEN tank_number = 3 THEN temperature END) as tank3,
-                        AVG(temperature) as average
-                    FROM temperature_readings
-                    WHERE timestamp >= ?
-                    GROUP BY timestamp
-                    ORDER BY timestamp ASC
-                ''', (cutoff_time,))
-
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                        datetime((bucket / ?) * ?, 'unixepoch') as timestamp,
+                        SUM(CASE WHEN tank_number = 1 THEN temperature_sum END)
+                            / SUM(CASE WHEN tank_number = 1 THEN reading_count END) as tank1,
+                        SUM(CASE WHEN tank_number = 2 THEN temperature_sum END)
+                            / SUM(CASE WHEN tank_number = 2 THEN reading_count END) as tank2,
+                        SUM(CASE WHEN tank_number = 3 THEN temperature_sum END)
+                            / SUM(CASE WHEN tank_number = 3 THEN reading_count END) as tank3,
+                        SUM(temperature_sum) / SUM(reading_count) as average
+                    FROM temperature_rollup
+                    WHERE bucket >= (CAST(strftime('%s', 'now', ?) AS INTEGER) / 60) * 60
+                    GROUP BY bucket / ?
+                    ORDER BY 1 ASC
+                ''', (bucket_seconds, bucket_seconds, window, bucket_seconds))
+
+                return _fetch_columns(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting averaged temperature history: {e}")
-            return []
+            raise
 
     def get_average_temperature_history_range(self, date_from: datetime, date_to: datetime,
-                                             interval_minutes: int = 5) -> List[Dict]:
+                                             interval_minutes: int = 5) -> Dict[str, List]:
         """
         Get average temperature history aggregated by time interval for custom date range.
 
@@ -310,38 +744,41 @@ class Database:
             interval_minutes: Grouping interval in minutes
 
         Returns:
-            List of averaged temperature readings with separate tank values
+            Dictionary of column lists (timestamp, tank1, tank2, tank3, average)
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
                 # Convert CET/CEST to UTC for database query
-                cutoff_from = self._cet_to_utc(date_from)
-                cutoff_to = self._cet_to_utc(date_to)
+                cutoff_from = self._cet_to_epoch(date_from)
+                cutoff_to = self._cet_to_epoch(date_to)
+                bucket_seconds = int(interval_minutes) * 60
 
-                cursor.execute(f'''
+                cursor.execute('''
                     SELECT
-                        datetime(
-                            (strftime('%s', timestamp) / ({interval_minutes} * 60)) * ({interval_minutes} * 60),
-                            'unixepoch'
-                        ) as timestamp,
-                        AVG(CASE WHEN tank_number = 1 THEN temperature END) as tank1,
-                        AVG(CASE WHEN tank_number = 2 THEN temperature END) as tank2,
-                        AVG(CASE WHEN tank_number = 3 THEN temperature END) as tank3,
-                        AVG(temperature) as average
-                    FROM temperature_readings
-                    WHERE timestamp >= ? AND timestamp <= ?
-                    GROUP BY timestamp
-                    ORDER BY timestamp ASC
-                ''', (cutoff_from, cutoff_to))
-
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                        datetime((bucket / ?) * ?, 'unixepoch') as timestamp,
+                        SUM(CASE WHEN tank_number = 1 THEN temperature_sum END)
+                            / SUM(CASE WHEN tank_number = 1 THEN reading_count END) as tank1,
+                        SUM(CASE WHEN tank_number = 2 THEN temperature_sum END)
+                            / SUM(CASE WHEN tank_number = 2 THEN reading_count END) as tank2,
+                        SUM(CASE WHEN tank_number = 3 THEN temperature_sum END)
+                            / SUM(CASE WHEN tank_number = 3 THEN reading_count END) as tank3,
+                        SUM(temperature_sum) / SUM(reading_count) as average
+                    FROM temperature_rollup
+                    WHERE bucket >= (? / 60) * 60 AND bucket <= ?
+                    GROUP BY bucket / ?
+                    ORDER BY 1 ASC
+                ''', (bucket_seconds, bucket_seconds, cutoff_from, cutoff_to, bucket_seconds))
+
+                return _fetch_columns(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting averaged temperature history by range: {e}")
-            return []
+            raise
 
     def get_recent_events(self, limit: int = 100, event_type: Optional[str] = None) -> List[Dict]:
         """
@@ -353,31 +790,35 @@ class Database:
 
         Returns:
             List of event dictionaries
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
                 if event_type:
                     cursor.execute('''
-                        SELECT * FROM system_events
+                        SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, event_type, description, data
+                        FROM system_events
                         WHERE event_type = ?
-                        ORDER BY timestamp DESC
+                        ORDER BY system_events.timestamp DESC
                         LIMIT ?
                     ''', (event_type, limit))
                 else:
                     cursor.execute('''
-                        SELECT * FROM system_events
-                        ORDER BY timestamp DESC
+                        SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, event_type, description, data
+                        FROM system_events
+                        ORDER BY system_events.timestamp DESC
                         LIMIT ?
                     ''', (limit,))
 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return _fetch_dicts(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting events: {e}")
-            return []
+            raise
 
     def get_events_range(self, date_from: datetime, date_to: datetime,
                         event_type: Optional[str] = None) -> List[Dict]:
@@ -391,34 +832,38 @@ class Database:
 
         Returns:
             List of event dictionaries
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
                 # Convert CET/CEST to UTC for database query
-                cutoff_from = self._cet_to_utc(date_from)
-                cutoff_to = self._cet_to_utc(date_to)
+                cutoff_from = self._cet_to_epoch(date_from)
+                cutoff_to = self._cet_to_epoch(date_to)
 
                 if event_type:
                     cursor.execute('''
-                        SELECT * FROM system_events
+                        SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, event_type, description, data
+                        FROM system_events
                         WHERE timestamp >= ? AND timestamp <= ? AND event_type = ?
-                        ORDER BY timestamp DESC
+                        ORDER BY system_events.timestamp DESC
                     ''', (cutoff_from, cutoff_to, event_type))
                 else:
                     cursor.execute('''
-                        SELECT * FROM system_events
+                        SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, event_type, description, data
+                        FROM system_events
                         WHERE timestamp >= ? AND timestamp <= ?
-                        ORDER BY timestamp DESC
+                        ORDER BY system_events.timestamp DESC
                     ''', (cutoff_from, cutoff_to))
 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return _fetch_dicts(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting events by range: {e}")
-            return []
+            raise
 
     def get_control_history(self, hours: int = 24) -> List[Dict]:
         """
@@ -429,25 +874,30 @@ class Database:
 
         Returns:
             List of control action dictionaries
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
-                cutoff_time = self._cet_to_utc(self._get_cet_now() - timedelta(hours=hours))
+                # Window start is computed by SQLite from a modifier such as '-24 hours'
+                window = f'-{int(hours)} hours'
 
                 cursor.execute('''
-                    SELECT * FROM control_actions
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp DESC
-                ''', (cutoff_time,))
+                    SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, action_type, heating_state, pump_state,
+                           average_temperature, setpoint
+                    FROM control_actions
+                    WHERE timestamp >= CAST(strftime('%s', 'now', ?) AS INTEGER)
+                    ORDER BY control_actions.timestamp DESC
+                ''', (window,))
 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return _fetch_dicts(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting control history: {e}")
-            return []
+            raise
 
     def get_control_history_range(self, date_from: datetime, date_to: datetime) -> List[Dict]:
         """
@@ -459,27 +909,61 @@ class Database:
 
         Returns:
             List of control action dictionaries
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
 
                 # Convert CET/CEST to UTC for database query
-                cutoff_from = self._cet_to_utc(date_from)
-                cutoff_to = self._cet_to_utc(date_to)
+                cutoff_from = self._cet_to_epoch(date_from)
+                cutoff_to = self._cet_to_epoch(date_to)
 
                 cursor.execute('''
-                    SELECT * FROM control_actions
+                    SELECT id, datetime(timestamp, 'unixepoch') AS timestamp, action_type, heating_state, pump_state,
+                           average_temperature, setpoint
+                    FROM control_actions
                     WHERE timestamp >= ? AND timestamp <= ?
-                    ORDER BY timestamp DESC
+                    ORDER BY control_actions.timestamp DESC
                 ''', (cutoff_from, cutoff_to))
 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return _fetch_dicts(cursor)
 
         except Exception as e:
             self.logger.error(f"Error getting control history by range: {e}")
-            return []
+            raise
+
+    def _delete_before(self, table: str, cutoff: int) -> int:
+        """
+        Delete rows older than cutoff in bounded batches.
+
+        Each batch is its own short write transaction, with a pause between
+        batches, so controller inserts can interleave with a large purge.
+
+        Args:
+            table: Table with an integer timestamp column
+            cutoff: Unix seconds; rows with an older timestamp are deleted
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        while True:
+            with self._get_connection() as conn:
+                cursor = conn.execute(f'''
+                    DELETE FROM {table}
+                    WHERE rowid IN (
+                        SELECT rowid FROM {table} WHERE timestamp < ? LIMIT ?
+                    )
+                ''', (cutoff, self.DELETE_BATCH_SIZE))
+                batch_deleted = cursor.rowcount
+
+            deleted += batch_deleted
+            if batch_deleted < self.DELETE_BATCH_SIZE:
+                return deleted
+            time.sleep(self.DELETE_BATCH_PAUSE)
 
     def cleanup_old_data(self, days_to_keep: int = 30):
         """
@@ -489,48 +973,48 @@ class Database:
             days_to_keep: Number of days of data to keep
         """
         try:
-            # Delete old data within transaction
+            # One cutoff for all tables, computed by SQLite from a modifier such as '-30 days'
+            with self._get_reader() as conn:
+                cutoff = conn.execute(
+                    "SELECT CAST(strftime('%s', 'now', ?) AS INTEGER)",
+                    (f'-{int(days_to_keep)} days',)
+                ).fetchone()[0]
+
+            temp_deleted = self._delete_before('temperature_readings', cutoff)
+            events_deleted = self._delete_before('system_events', cutoff)
+            actions_deleted = self._delete_before('control_actions', cutoff)
+
+            # Only minute buckets that end before the cutoff (a few rows per minute)
             with self._get_connection() as conn:
-                cursor = conn.cursor()
+                conn.execute('DELETE FROM temperature_rollup WHERE bucket <= ? - 60', (cutoff,))
 
-                cutoff_time = self._cet_to_utc(self._get_cet_now() - timedelta(days=days_to_keep))
-
-                # Clean up old temperature readings
-                cursor.execute('''
-                    DELETE FROM temperature_readings
-                    WHERE timestamp < ?
-                ''', (cutoff_time,))
-                temp_deleted = cursor.rowcount
-
-                # Clean up old events
-                cursor.execute('''
-                    DELETE FROM system_events
-                    WHERE timestamp < ?
-                ''', (cutoff_time,))
-                events_deleted = cursor.rowcount
+            self.logger.info(
+                f"Cleaned up old data: {temp_deleted} temperatures, "
+                f"{events_deleted} events, {actions_deleted} actions"
+            )
 
-                # Clean up old control actions
-                cursor.execute('''
-                    DELETE FROM control_actions
-                    WHERE timestamp < ?
-                ''', (cutoff_time,))
-                actions_deleted = cursor.rowcount
-
-                self.logger.info(
-                    f"Cleaned up old data: {temp_deleted} temperatures, "
-                    f"{events_deleted} events, {actions_deleted} actions"
-                )
-
-            # Vacuum database outside transaction to reclaim space
+            # Release a bounded number of free pages outside the transaction, but
+            # only once enough have accumulated (new rows reuse free pages anyway)
             if temp_deleted > 0 or events_deleted > 0 or actions_deleted > 0:
                 try:
-                    conn = sqlite3.connect(self.db_path)
-                    conn.execute('VACUUM')
-                    conn.close()
-                    self.logger.info("Database vacuumed successfully")
+                    with self._get_reader() as conn:
+                        free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                    if free_pages >= self.VACUUM_FREE_PAGE_THRESHOLD:
+                        self._incremental_vacuum(self.INCREMENTAL_VACUUM_PAGES)
+                        self.logger.info(f"Database vacuumed successfully ({free_pages} free pages)")
                 except Exception as vacuum_error:
                     self.logger.error(f"Error vacuuming database: {vacuum_error}")
 
+            # Daily cleanup is a good point to keep planner statistics current
+            self._analyze()
+
+            # Checkpoint last, so the WAL is also emptied of the ANALYZE writes
+            if temp_deleted > 0 or events_deleted > 0 or actions_deleted > 0:
+                try:
+                    self._checkpoint()
+                except Exception as checkpoint_error:
+                    self.logger.error(f"Error checkpointing database: {checkpoint_error}")
+
         except Exception as e:
             self.logger.error(f"Error cleaning up old data: {e}")
 
@@ -540,28 +1024,26 @@ class Database:
 
         Returns:
             Dictionary with database statistics
-        """
-        import os
 
+        Raises:
+            sqlite3.Error: If the query fails
+        """
         try:
-            # Get file size
-            size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
-
-            # Get record counts
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-
-                cursor.execute("SELECT COUNT(*) FROM temperature_readings")
-                temp_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(*) FROM system_events")
-                events_count = cursor.fetchone()[0]
+            # Size and counts from one snapshot; page_count includes pages still in the WAL
+            with self._get_reader(snapshot=True) as conn:
+                page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+                page_size = conn.execute('PRAGMA page_size').fetchone()[0]
 
-                cursor.execute("SELECT COUNT(*) FROM control_actions")
-                actions_count = cursor.fetchone()[0]
+                # COUNT(*) walks the smallest index rather than the table
+                temp_count, events_count, actions_count = conn.execute('''
+                    SELECT
+                        (SELECT COUNT(*) FROM temperature_readings),
+                        (SELECT COUNT(*) FROM system_events),
+                        (SELECT COUNT(*) FROM control_actions)
+                ''').fetchone()
 
                 return {
-                    'size': size,
+                    'size': page_count * page_size,
                     'temperature_records': temp_count,
                     'event_records': events_count,
                     'control_records': actions_count
@@ -569,12 +1051,7 @@ class Database:
 
         except Exception as e:
             self.logger.error(f"Error getting database info: {e}")
-            return {
-                'size': 0,
-                'temperature_records': 0,
-                'event_records': 0,
-                'control_records': 0
-            }
+            raise
 
     def delete_all_data(self) -> Dict:
         """
@@ -599,6 +1076,8 @@ class Database:
                 cursor.execute("DELETE FROM control_actions")
                 actions_deleted = cursor.rowcount
 
+                cursor.execute("DELETE FROM temperature_rollup")
+
                 self.logger.warning(
                     f"Database cleared: {temp_deleted} temperatures, "
                     f"{events_deleted} events, {actions_deleted} actions deleted"
@@ -606,9 +1085,8 @@ class Database:
 
             # Vacuum database to reclaim space
             try:
-                conn = sqlite3.connect(self.db_path)
-                conn.execute('VACUUM')
-                conn.close()
+                self._incremental_vacuum()
+                self._checkpoint()
                 self.logger.info("Database vacuumed after deletion")
             except Exception as vacuum_error:
                 self.logger.error(f"Error vacuuming database after deletion: {vacuum_error}")
@@ -632,89 +1110,97 @@ class Database:
 
         Returns:
             Dictionary with statistics
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_reader(snapshot=True) as conn:
                 cursor = conn.cursor()
 
-                cutoff_time = self._cet_to_utc(self._get_cet_now() - timedelta(hours=hours))
+                # Window start is computed by SQLite from a modifier such as '-24 hours'
+                window = f'-{int(hours)} hours'
 
-                # Overall temperature statistics
-                cursor.execute('''
-                    SELECT
-                        COUNT(*) as reading_count,
-                        AVG(temperature) as avg_temperature,
-                        MIN(temperature) as min_temperature,
-                        MAX(temperature) as max_temperature
-                    FROM temperature_readings
-                    WHERE timestamp >= ?
-                ''', (cutoff_time,))
-
-                overall_stats = dict(cursor.fetchone())
-
-                # Per-tank temperature statistics
+                # Per-tank temperature statistics in a single scan; the overall
+                # figures are folded from the groups (NULL tank included)
                 cursor.execute('''
                     SELECT
                         tank_number,
                         COUNT(*) as reading_count,
-                        AVG(temperature) as avg_temperature,
+                        SUM(temperature) as temperature_sum,
                         MIN(temperature) as min_temperature,
                         MAX(temperature) as max_temperature
                     FROM temperature_readings
-                    WHERE timestamp >= ? AND tank_number IS NOT NULL
+                    WHERE timestamp >= CAST(strftime('%s', 'now', ?) AS INTEGER)
                     GROUP BY tank_number
                     ORDER BY tank_number
-                ''', (cutoff_time,))
-
-                tanks = [dict(row) for row in cursor.fetchall()]
+                ''', (window,))
+
+                tanks = []
+                reading_count = 0
+                temperature_sum = 0.0
+                min_temperature = None
+                max_temperature = None
+
+                for row in _fetch_dicts(cursor):
+                    count = row['reading_count']
+                    reading_count += count
+                    temperature_sum += row['temperature_sum']
+                    if min_temperature is None or row['min_temperature'] < min_temperature:
+                        min_temperature = row['min_temperature']
+                    if max_temperature is None or row['max_temperature'] > max_temperature:
+                        max_temperature = row['max_temperature']
+
+                    if row['tank_number'] is not None:
+                        tanks.append({
+                            'tank_number': row['tank_number'],
+                            'reading_count': count,
+                            'avg_temperature': row['temperature_sum'] / count,
+                            'min_temperature': row['min_temperature'],
+                            'max_temperature': row['max_temperature']
+                        })
+
+                overall_stats = {
+                    'reading_count': reading_count,
+                    'avg_temperature': temperature_sum / reading_count if reading_count else None,
+                    'min_temperature': min_temperature,
+                    'max_temperature': max_temperature
+                }
 
-                # Control statistics - calculate time based on state changes
+                # Control statistics - each heating_on lasts until the next action
+                # if that is heating_off, or until now if it is the last action;
+                # an on followed by another on is a restarted cycle and adds no time
                 cursor.execute('''
                     SELECT
-                        action_type,
-                        timestamp
-                    FROM control_actions
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp ASC
-                ''', (cutoff_time,))
-
-                actions = cursor.fetchall()
-
-                # Calculate heating/pump on time
-                heating_on_time = 0
-                pump_on_time = 0
-                heating_cycles = 0
-
-                heating_on = False
-                pump_on = False
-                last_heating_on_time = None
-                last_pump_on_time = None
-
-                for action in actions:
-                    action_dict = dict(action)
-                    action_type = action_dict['action_type']
-                    timestamp = datetime.fromisoformat(action_dict['timestamp'])
-
-                    if action_type == 'heating_on':
-                        heating_on = True
-                        heating_cycles += 1
-                        last_heating_on_time = timestamp
-                    elif action_type == 'heating_off' and heating_on:
-                        heating_on = False
-                        if last_heating_on_time:
-                            heating_on_time += (timestamp - last_heating_on_time).total_seconds()
-
-                # If heating is still on, count until now (use UTC since timestamps are UTC)
-                if heating_on and last_heating_on_time:
-                    now_utc = self._cet_to_utc(self._get_cet_now())
-                    heating_on_time += (now_utc - last_heating_on_time).total_seconds()
-
-                # Estimate pump time (same as heating time + pump_delay)
-                pump_on_time = heating_on_time
+                        COUNT(*) as heating_cycles,
+                        IFNULL(SUM(
+                            CASE
+                                WHEN next_action IS NULL
+                                    THEN CAST(strftime('%s', 'now') AS INTEGER) - timestamp
+                                WHEN next_action = 'heating_off'
+                                    THEN next_timestamp - timestamp
+                                ELSE 0
+                            END
+                        ), 0) as heating_on_time
+                    FROM (
+                        SELECT
+                            action_type,
+                            timestamp,
+                            LEAD(action_type) OVER w as next_action,
+                            LEAD(timestamp) OVER w as next_timestamp
+                        FROM control_actions
+                        WHERE timestamp >= CAST(strftime('%s', 'now', ?) AS INTEGER)
+                        WINDOW w AS (ORDER BY timestamp, id)
+                    )
+                    WHERE action_type = 'heating_on'
+                ''', (window,))
+
+                heating_cycles, heating_on_time = cursor.fetchone()
 
                 control_stats = {
                     'heating_on_time': heating_on_time,
-                    'pump_on_time': pump_on_time,
+                    # Estimate pump time (same as heating time + pump_delay)
+                    'pump_on_time': heating_on_time,
                     'heating_cycles': heating_cycles
                 }
 
@@ -727,4 +1213,5 @@ class Database:
 
         except Exception as e:
             self.logger.error(f"Error getting statistics: {e}")
-            return {}
+            raise
+
@@ -16,6 +16,10 @@ from threading import Thread
 class EvokClient:
     """Client for communicating with Evok API."""
 
+    # Minimum number of pooled keep-alive connections to Evok; the pool grows
+    # to the sensor count so parallel sensor reads never wait for a connection
+    POOL_SIZE = 4
+
     def __init__(self, host: str = '127.0.0.1', port: int = 8080):
         """
         Initialize Evok client.
@@ -32,6 +36,29 @@ class EvokClient:
         self.ws_thread = None
         self.logger = logging.getLogger(__name__)
 
+        # Persistent HTTP session: keep-alive connections to Evok are reused
+        # across control cycles instead of opening a TCP connection per call.
+        # The pool is sized for the controller's parallel sensor reads.
+        self.session = requests.Session()
+        self.pool_size = 0
+        self._resize_pool(self.POOL_SIZE)
+
+    def _resize_pool(self, size: int):
+        """
+        Grow the HTTP connection pool to at least the given size.
+
+        Args:
+            size: Number of connections needed concurrently
+        """
+        if size <= self.pool_size:
+            return
+        self.pool_size = size
+        old_adapter = self.session.adapters.get('http://')
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        self.session.mount('http://', adapter)
+        if old_adapter is not None:
+            old_adapter.close()
+
     def get_all_sensors(self) -> Optional[List[Dict[str, Any]]]:
         """
         Get all 1-wire temperature sensors.
@@ -41,7 +68,7 @@ class EvokClient:
         """
         try:
             # Get all devices and filter for temperature sensors
-            response = requests.get(f"{self.base_url}/json/all", timeout=5)
+            response = self.session.get(f"{self.base_url}/json/all", timeout=5)
             response.raise_for_status()
             all_devices = response.json()
 
@@ -50,6 +77,7 @@ class EvokClient:
                       if device.get('dev') == 'temp' and device.get('type') == 'DS18B20']
 
             self.logger.info(f"Found {len(sensors)} DS18B20 temperature sensors")
+            self._resize_pool(len(sensors))
             return sensors
         except Exception as e:
             self.logger.error(f"Error getting sensors: {e}")
@@ -66,7 +94,7 @@ class EvokClient:
             Temperature in Celsius or None on error
         """
         try:
-            response = requests.get(f"{self.base_url}/json/temp/{sensor_id}", timeout=5)
+            response = self.session.get(f"{self.base_url}/json/temp/{sensor_id}", timeout=5)
             response.raise_for_status()
             data = response.json()
             return float(data.get('value', 0.0))
@@ -87,7 +115,7 @@ class EvokClient:
         """
         try:
             value = 1 if state else 0
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/json/ro/{circuit}",
                 json={"value": value},
                 timeout=5
@@ -110,7 +138,7 @@ class EvokClient:
             True if ON, False if OFF, None on error
         """
         try:
-            response = requests.get(f"{self.base_url}/json/ro/{circuit}", timeout=5)
+            response = self.session.get(f"{self.base_url}/json/ro/{circuit}", timeout=5)
             response.raise_for_status()
             data = response.json()
             return bool(data.get('value', 0))
@@ -153,6 +181,11 @@ class EvokClient:
         self.ws_thread = Thread(target=self.ws.run_forever, daemon=True)
         self.ws_thread.start()
 
+    def close(self):
+        """Close pooled HTTP connections and the WebSocket connection."""
+        self.stop_websocket()
+        self.session.close()
+
     def stop_websocket(self):
         """Stop WebSocket connection."""
         if self.ws:
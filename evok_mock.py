@@ -154,6 +154,10 @@ class MockEvokClient:
         """Mock WebSocket stop (does nothing)."""
         self.logger.info('Mock: WebSocket disconnection simulated (no-op)')
 
+    def close(self):
+        """Mock client close (does nothing)."""
+        self.stop_websocket()
+
 
 # Factory function to choose between real and mock client
 def create_evok_client(host: str = '127.0.0.1', port: int = 8080, mock: bool = False):
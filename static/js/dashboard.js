@@ -135,14 +135,10 @@ function initWebSocket() {
         }
     });
 
-    socket.on('temperature_update', (data) => {
-        updateTemperatureDisplay(data);
-        updateTemperatureChart(data);
-        markDataUpdated();
-    });
-
-    socket.on('status_update', (data) => {
-        updateStatusDisplay(data);
+    socket.on('snapshot', (data) => {
+        updateTemperatureDisplay(data.temperature);
+        updateTemperatureChart(data.temperature);
+        updateStatusDisplay(data.status);
         markDataUpdated();
     });
 
@@ -341,26 +337,20 @@ async function loadHistoricalData() {
         // Fetch last 2 hours of averaged data (5-minute intervals)
         const response = await utils.apiCall('/api/history/average?hours=2&interval=5');
 
-        if (response.success && response.data && response.data.length > 0) {
-            // Clear existing data
-            temperatureHistory.labels = [];
-            temperatureHistory.tank1 = [];
-            temperatureHistory.tank2 = [];
-            temperatureHistory.tank3 = [];
-            temperatureHistory.average = [];
-
-            // Load historical data
-            response.data.forEach(point => {
-                const time = new Date(point.timestamp).toLocaleTimeString('cs-CZ', {
+        if (response.success && response.data && response.data.timestamp.length > 0) {
+            const data = response.data;
+
+            // Load historical data (the API returns one array per column)
+            temperatureHistory.labels = data.timestamp.map(timestamp =>
+                new Date(timestamp).toLocaleTimeString('cs-CZ', {
                     hour: '2-digit',
                     minute: '2-digit'
-                });
-                temperatureHistory.labels.push(time);
-                temperatureHistory.tank1.push(point.tank1 || null);
-                temperatureHistory.tank2.push(point.tank2 || null);
-                temperatureHistory.tank3.push(point.tank3 || null);
-                temperatureHistory.average.push(point.average || null);
-            });
+                })
+            );
+            temperatureHistory.tank1 = data.tank1.map(value => value || null);
+            temperatureHistory.tank2 = data.tank2.map(value => value || null);
+            temperatureHistory.tank3 = data.tank3.map(value => value || null);
+            temperatureHistory.average = data.average.map(value => value || null);
 
             // Update chart with historical data
             if (temperatureChart) {
@@ -372,7 +362,7 @@ async function loadHistoricalData() {
                 temperatureChart.update();
             }
 
-            console.log('Historical data loaded:', response.data.length, 'points');
+            console.log('Historical data loaded:', data.timestamp.length, 'points');
         }
     } catch (error) {
         console.error('Error loading historical data:', error);
@@ -5,8 +5,8 @@
 // Chart instance
 let historyChart;
 
-// Pagination state
-let temperatureData = [];
+// Pagination state (temperature history is column-oriented, oldest first)
+let temperatureData = { timestamp: [], tank1: [], tank2: [], tank3: [], average: [] };
 let eventsData = [];
 let controlData = [];
 let currentTempPage = 1;
@@ -136,12 +136,11 @@ async function loadTemperatureHistory() {
     try {
         const rangeType = document.getElementById('temp-range-type').value;
         const interval = document.getElementById('temp-interval').value;
-        const cacheBuster = new Date().getTime();
 
         let url;
         if (rangeType === 'relative') {
             const hours = document.getElementById('temp-hours').value;
-            url = `/api/history/average?hours=${hours}&interval=${interval}&_=${cacheBuster}`;
+            url = `/api/history/average?hours=${hours}&interval=${interval}`;
         } else {
             const dateFrom = document.getElementById('temp-date-from').value;
             const dateTo = document.getElementById('temp-date-to').value;
@@ -151,17 +150,17 @@ async function loadTemperatureHistory() {
                 return;
             }
 
-            url = `/api/history/average/range?from=${encodeURIComponent(dateFrom)}&to=${encodeURIComponent(dateTo)}&interval=${interval}&_=${cacheBuster}`;
+            url = `/api/history/average/range?from=${encodeURIComponent(dateFrom)}&to=${encodeURIComponent(dateTo)}&interval=${interval}`;
         }
 
         const response = await utils.apiCall(url);
 
         if (response.success && response.data) {
-            // Store data for pagination - REVERSE to show newest first
-            temperatureData = [...response.data].reverse();
+            // Store data for pagination (the table walks it backwards to show newest first)
+            temperatureData = response.data;
             currentTempPage = 1;
 
-            // Update chart with all data (keep chronological order - oldest to newest)
+            // Update chart with all data (chronological order - oldest to newest)
             updateTemperatureChart(response.data);
 
             // Update table with first page (newest records first)
@@ -177,35 +176,25 @@ async function loadTemperatureHistory() {
  * Update temperature chart with data
  */
 function updateTemperatureChart(data) {
-    const labels = [];
-    const tank1Data = [];
-    const tank2Data = [];
-    const tank3Data = [];
-    const avgData = [];
-
-    data.forEach(point => {
+    const labels = data.timestamp.map(timestamp => {
         // Parse UTC timestamp and convert to CET
-        const utcDate = new Date(point.timestamp + 'Z'); // Add Z to indicate UTC
-        const time = utcDate.toLocaleString('cs-CZ', {
+        const utcDate = new Date(timestamp + 'Z'); // Add Z to indicate UTC
+        return utcDate.toLocaleString('cs-CZ', {
             month: '2-digit',
             day: '2-digit',
             hour: '2-digit',
             minute: '2-digit',
             timeZone: 'Europe/Prague'
         });
-        labels.push(time);
-        tank1Data.push(point.tank1);
-        tank2Data.push(point.tank2);
-        tank3Data.push(point.tank3);
-        avgData.push(point.average);
     });
 
     if (historyChart) {
+        // Column arrays from the API are handed to Chart.js as they are
         historyChart.data.labels = labels;
-        historyChart.data.datasets[0].data = tank1Data;
-        historyChart.data.datasets[1].data = tank2Data;
-        historyChart.data.datasets[2].data = tank3Data;
-        historyChart.data.datasets[3].data = avgData;
+        historyChart.data.datasets[0].data = data.tank1;
+        historyChart.data.datasets[1].data = data.tank2;
+        historyChart.data.datasets[2].data = data.tank3;
+        historyChart.data.datasets[3].data = data.average;
         historyChart.update();
     }
 }
@@ -217,20 +206,34 @@ function updateTemperatureTable() {
     const tbody = document.getElementById('temp-table-body');
     if (!tbody) return;
 
-    if (temperatureData.length === 0) {
+    const total = temperatureData.timestamp.length;
+
+    if (total === 0) {
         tbody.innerHTML = '<tr><td colspan="5" class="empty">Žádná data k zobrazení</td></tr>';
         updatePaginationControls(0);
         return;
     }
 
     // Calculate pagination
-    const totalPages = Math.ceil(temperatureData.length / rowsPerPage);
+    const totalPages = Math.ceil(total / rowsPerPage);
     const startIndex = (currentTempPage - 1) * rowsPerPage;
-    const endIndex = Math.min(startIndex + rowsPerPage, temperatureData.length);
-    const pageData = temperatureData.slice(startIndex, endIndex);
+    const endIndex = Math.min(startIndex + rowsPerPage, total);
+
+    // Table rows are newest first, so page positions count back from the last column entry
+    const pageIndices = [];
+    for (let position = startIndex; position < endIndex; position++) {
+        pageIndices.push(total - 1 - position);
+    }
 
     // Update table with current page data
-    tbody.innerHTML = pageData.map(point => {
+    tbody.innerHTML = pageIndices.map(i => {
+        const point = {
+            timestamp: temperatureData.timestamp[i],
+            tank1: temperatureData.tank1[i],
+            tank2: temperatureData.tank2[i],
+            tank3: temperatureData.tank3[i],
+            average: temperatureData.average[i]
+        };
         // Parse UTC timestamp and convert to CET
         const utcDate = new Date(point.timestamp + 'Z'); // Add Z to indicate UTC
         const time = utcDate.toLocaleString('cs-CZ', {
@@ -271,14 +274,15 @@ function updatePaginationControls(totalPages) {
     paginationDiv.style.display = 'flex';
 
     const startRecord = ((currentTempPage - 1) * rowsPerPage) + 1;
-    const endRecord = Math.min(currentTempPage * rowsPerPage, temperatureData.length);
+    const totalRecords = temperatureData.timestamp.length;
+    const endRecord = Math.min(currentTempPage * rowsPerPage, totalRecords);
 
     paginationDiv.innerHTML = `
         <button class="btn btn-secondary" id="prev-page" ${currentTempPage === 1 ? 'disabled' : ''}>
             ← Předchozí
         </button>
         <span class="pagination-info">
-            Stránka ${currentTempPage} z ${totalPages} (zobrazeno ${startRecord}-${endRecord} z ${temperatureData.length} záznamů)
+            Stránka ${currentTempPage} z ${totalPages} (zobrazeno ${startRecord}-${endRecord} z ${totalRecords} záznamů)
         </span>
         <button class="btn btn-secondary" id="next-page" ${currentTempPage === totalPages ? 'disabled' : ''}>
             Další →
@@ -343,12 +347,11 @@ async function loadEvents() {
     try {
         const rangeType = document.getElementById('events-range-type').value;
         const eventType = document.getElementById('event-type').value;
-        const cacheBuster = new Date().getTime();
 
         let url;
         if (rangeType === 'relative') {
             const hours = document.getElementById('events-hours').value;
-            url = `/api/history/events?hours=${hours}&limit=10000&_=${cacheBuster}`;
+            url = `/api/history/events?hours=${hours}&limit=10000`;
         } else {
             const dateFrom = document.getElementById('events-date-from').value;
             const dateTo = document.getElementById('events-date-to').value;
@@ -358,7 +361,7 @@ async function loadEvents() {
                 return;
             }
 
-            url = `/api/history/events/range?from=${encodeURIComponent(dateFrom)}&to=${encodeURIComponent(dateTo)}&_=${cacheBuster}`;
+            url = `/api/history/events/range?from=${encodeURIComponent(dateFrom)}&to=${encodeURIComponent(dateTo)}`;
         }
 
         if (eventType) {
@@ -477,12 +480,11 @@ function updateEventsPaginationControls(totalPages) {
 async function loadControlHistory() {
     try {
         const rangeType = document.getElementById('control-range-type').value;
-        const cacheBuster = new Date().getTime();
 
         let url;
         if (rangeType === 'relative') {
             const hours = document.getElementById('control-hours').value;
-            url = `/api/history/control?hours=${hours}&_=${cacheBuster}`;
+            url = `/api/history/control?hours=${hours}`;
         } else {
             const dateFrom = document.getElementById('control-date-from').value;
             const dateTo = document.getElementById('control-date-to').value;
@@ -492,7 +494,7 @@ async function loadControlHistory() {
                 return;
             }
 
-            url = `/api/history/control/range?from=${encodeURIComponent(dateFrom)}&to=${encodeURIComponent(dateTo)}&_=${cacheBuster}`;
+            url = `/api/history/control/range?from=${encodeURIComponent(dateFrom)}&to=${encodeURIComponent(dateTo)}`;
         }
 
         const response = await utils.apiCall(url);
@@ -609,9 +611,7 @@ function updateControlPaginationControls(totalPages) {
 async function loadStatistics() {
     try {
         const hours = document.getElementById('stats-hours').value;
-        // Add cache buster
-        const cacheBuster = new Date().getTime();
-        const response = await utils.apiCall(`/api/statistics?hours=${hours}&_=${cacheBuster}`);
+        const response = await utils.apiCall(`/api/statistics?hours=${hours}`);
 
         if (response.success && response.data) {
             updateStatistics(response.data);
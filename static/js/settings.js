@@ -19,8 +19,8 @@ function initWebSocket() {
         console.log('Connected to server');
     });
 
-    socket.on('status_update', (data) => {
-        updateCurrentStatus(data);
+    socket.on('snapshot', (data) => {
+        updateCurrentStatus(data.status);
     });
 }
 
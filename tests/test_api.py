@@ -9,12 +9,14 @@ import unittest
 import json
 import tempfile
 import os
+import hashlib
+import sqlite3
 from unittest.mock import Mock, patch, MagicMock
 
 # Import app dependencies after preventing app initialization
 os.environ['USE_MOCK_EVOK'] = 'true'
 
-from app import app, socketio, system_config, db
+from app import app, socketio, system_config, db, response_cache, snapshot_changed
 from config import SystemConfig
 from control import TemperatureController
 
@@ -59,6 +61,11 @@ class TestFlaskAPI(unittest.TestCase):
         response = self.client.get('/login')
         self.assertEqual(response.status_code, 200)
 
+    def test_static_urls_versioned(self):
+        """Test static file URLs carry a version so updated files bypass the browser cache."""
+        response = self.client.get('/login')
+        self.assertIn(b'/static/css/style.css?v=', response.data)
+
     @patch('app.check_auth')
     def test_login_post_success(self, mock_check_auth):
         """Test successful login."""
@@ -84,6 +91,90 @@ class TestFlaskAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn(b'Neplatn', response.data)  # Czech error message
 
+    @patch('app.check_auth')
+    def test_login_rate_limited(self, mock_check_auth):
+        """Test repeated login attempts are throttled before hashing."""
+        import auth
+
+        mock_check_auth.return_value = False
+        auth._login_attempts.clear()
+        try:
+            for _ in range(auth.LOGIN_ATTEMPT_LIMIT):
+                response = self.client.post('/login', data={'username': 'x', 'password': 'x'})
+                self.assertEqual(response.status_code, 200)
+
+            response = self.client.post('/login', data={'username': 'x', 'password': 'x'})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(mock_check_auth.call_count, auth.LOGIN_ATTEMPT_LIMIT)
+        finally:
+            auth._login_attempts.clear()
+
+    @patch('app.check_auth')
+    def test_successful_logins_not_rate_limited(self, mock_check_auth):
+        """Test successful logins do not use up the failed attempt budget."""
+        import auth
+
+        mock_check_auth.return_value = True
+        auth._login_attempts.clear()
+        try:
+            for _ in range(auth.LOGIN_ATTEMPT_LIMIT + 1):
+                response = self.client.post('/login', data={'username': 'x', 'password': 'x'})
+                self.assertEqual(response.status_code, 302)
+            self.assertEqual(len(auth._login_attempts), 0)
+        finally:
+            auth._login_attempts.clear()
+
+    @patch('app.check_auth')
+    def test_login_rate_limit_per_forwarded_client(self, mock_check_auth):
+        """Test clients behind the proxy are throttled by their forwarded address."""
+        import auth
+
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        mock_check_auth.return_value = False
+        auth._login_attempts.clear()
+        try:
+            with patch.object(app, 'wsgi_app', ProxyFix(app.wsgi_app, x_for=1)):
+                for _ in range(auth.LOGIN_ATTEMPT_LIMIT):
+                    self.client.post('/login', data={'username': 'x', 'password': 'x'},
+                                     headers={'X-Forwarded-For': '192.0.2.1'})
+
+                response = self.client.post('/login', data={'username': 'x', 'password': 'x'},
+                                            headers={'X-Forwarded-For': '192.0.2.2'})
+            self.assertEqual(response.status_code, 200)
+        finally:
+            auth._login_attempts.clear()
+
+    def test_login_attempts_table_bounded(self):
+        """Test failed attempts from many clients do not grow the table without bound."""
+        import auth
+
+        auth._login_attempts.clear()
+        try:
+            for i in range(auth.LOGIN_ATTEMPT_MAX_CLIENTS + 10):
+                auth.record_login_failure(f'client{i}')
+            self.assertEqual(len(auth._login_attempts), auth.LOGIN_ATTEMPT_MAX_CLIENTS)
+        finally:
+            auth._login_attempts.clear()
+
+    @patch('app.check_auth')
+    def test_forwarded_for_ignored_without_trusted_proxy(self, mock_check_auth):
+        """Test a client cannot escape throttling by rotating X-Forwarded-For."""
+        import auth
+
+        mock_check_auth.return_value = False
+        auth._login_attempts.clear()
+        try:
+            for i in range(auth.LOGIN_ATTEMPT_LIMIT):
+                self.client.post('/login', data={'username': 'x', 'password': 'x'},
+                                 headers={'X-Forwarded-For': f'192.0.2.{i}'})
+
+            response = self.client.post('/login', data={'username': 'x', 'password': 'x'},
+                                        headers={'X-Forwarded-For': '192.0.2.99'})
+            self.assertEqual(response.status_code, 429)
+        finally:
+            auth._login_attempts.clear()
+
     def test_logout(self):
         """Test logout functionality."""
         response = self.client.get('/logout', follow_redirects=True)
@@ -117,6 +208,22 @@ class TestFlaskAPI(unittest.TestCase):
             self.assertFalse(data['heating'])
             self.assertFalse(data['pump'])
 
+    def test_rescan_sensors(self):
+        """Test sensor rescan endpoint runs discovery."""
+        controller = Mock()
+        controller.discover_sensors.return_value = True
+        controller.sensor_ids = ['sensor1', 'sensor2']
+
+        with patch('app.temp_controller', controller):
+            response = self.client.post('/api/sensors/rescan')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data)['sensor_count'], 2)
+            controller.discover_sensors.assert_called_once()
+
+        with patch('app.temp_controller', None):
+            response = self.client.post('/api/sensors/rescan')
+            self.assertEqual(response.status_code, 503)
+
     def test_get_settings(self):
         """Test loading settings."""
         response = self.client.get('/api/settings')
@@ -272,6 +379,9 @@ class TestFlaskAPI(unittest.TestCase):
 
         data = json.loads(response.data)
         self.assertTrue(data['success'])
+        # Column-oriented: one equally long array per field
+        self.assertEqual(set(data['data']), {'timestamp', 'tank1', 'tank2', 'tank3', 'average'})
+        self.assertEqual(len({len(values) for values in data['data'].values()}), 1)
 
     def test_get_events_history(self):
         """Test system events endpoint."""
@@ -297,6 +407,42 @@ class TestFlaskAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertTrue(data['success'])
 
+    def test_history_response_cached(self):
+        """Test repeated history requests are served from the response cache."""
+        response_cache.clear()
+
+        with patch('app.db.get_control_history', return_value=[]) as mock_history:
+            response1 = self.client.get('/api/history/control?hours=6')
+            response2 = self.client.get('/api/history/control?hours=6')
+
+        self.assertEqual(response1.status_code, 200)
+        self.assertEqual(response1.data, response2.data)
+        mock_history.assert_called_once_with(hours=6)
+
+    def test_cached_response_arguments_in_key(self):
+        """Test every query argument is part of the response cache key."""
+        response_cache.clear()
+
+        with patch('app.db.get_control_history', return_value=[]) as mock_history:
+            self.client.get('/api/history/control?hours=6&_=1000')
+            response = self.client.get('/api/history/control?hours=6&_=2000')
+
+        self.assertEqual(mock_history.call_count, 2)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+
+    def test_failed_history_query_not_cached(self):
+        """Test a failed history query returns 500 and is not cached."""
+        response_cache.clear()
+
+        with patch('app.db.get_control_history',
+                   side_effect=[sqlite3.OperationalError('database is locked'), []]) as mock_history:
+            response1 = self.client.get('/api/history/control?hours=6')
+            response2 = self.client.get('/api/history/control?hours=6')
+
+        self.assertEqual(response1.status_code, 500)
+        self.assertEqual(response2.status_code, 200)
+        self.assertEqual(mock_history.call_count, 2)
+
     def test_get_database_stats(self):
         """Test database statistics endpoint."""
         response = self.client.get('/api/database/stats')
@@ -383,6 +529,32 @@ class TestAuthentication(unittest.TestCase):
             response = self.client.get(route)
             self.assertIn(response.status_code, [302, 401, 403])
 
+    def test_check_auth_credentials(self):
+        """Test credential verification for known and unknown users."""
+        from auth import check_auth
+
+        self.assertTrue(check_auth('admin', 'admin123'))
+        self.assertFalse(check_auth('admin', 'wrong'))
+        self.assertFalse(check_auth('nobody', 'admin123'))
+        self.assertFalse(check_auth('nobody', None))
+
+    def test_super_admin_verification_cached(self):
+        """Test a verified super admin password skips re-hashing."""
+        import auth
+
+        auth._super_admin_verified_digest = None
+        with patch('auth.check_password_hash', wraps=auth.check_password_hash) as mock_check:
+            self.assertTrue(auth.check_super_admin_auth('superadmin123'))
+            self.assertTrue(auth.check_super_admin_auth('superadmin123'))
+            self.assertFalse(auth.check_super_admin_auth('wrong'))
+            self.assertFalse(auth.check_super_admin_auth(''))
+
+        self.assertEqual(mock_check.call_count, 2)
+
+        # The cached digest is keyed, not a plain hash of the password
+        self.assertNotEqual(auth._super_admin_verified_digest,
+                            hashlib.sha256(b'superadmin123').digest())
+
     def test_session_persistence(self):
         """Test that session persists across requests."""
         with self.client.session_transaction() as sess:
@@ -426,6 +598,84 @@ class TestWebSocket(unittest.TestCase):
         self.assertGreater(len(status_messages), 0)
 
 
+class TestBroadcastWait(unittest.TestCase):
+    """Test the broadcaster's wait does not block the async server."""
+
+    def test_server_responds_while_broadcaster_waits(self):
+        """Test HTTP requests are served while the broadcaster waits for the controller."""
+        import threading
+        import eventlet
+        import eventlet.wsgi
+        from eventlet.green.urllib import request as green_request
+        from app import wait_for_controller_update
+
+        sock = eventlet.listen(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        server = eventlet.spawn(eventlet.wsgi.server, sock, app, log_output=False)
+        controller = Mock(update_event=threading.Event())
+
+        try:
+            with patch('app.temp_controller', controller):
+                waiter = eventlet.spawn(wait_for_controller_update, 2.0)
+                eventlet.sleep(0)
+
+                with eventlet.Timeout(1):
+                    response = green_request.urlopen(f'http://127.0.0.1:{port}/login')
+                self.assertEqual(response.status, 200)
+                self.assertFalse(waiter.dead)  # Still waiting for the controller
+                waiter.kill()
+        finally:
+            server.kill()
+            sock.close()
+
+
+class TestBroadcastSnapshot(unittest.TestCase):
+    """Test change detection for WebSocket broadcasts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.snapshot = {
+            'temperature': {'tank1': 60.0, 'tank2': 61.0, 'tank3': None, 'average': 60.5},
+            'status': {'heating': False, 'pump': False, 'setpoint': 60.0,
+                       'temperatures': {'sensor1': 60.0}, 'average_temperature': 60.5}
+        }
+
+    def _copy(self):
+        return {
+            'temperature': dict(self.snapshot['temperature']),
+            'status': dict(self.snapshot['status'])
+        }
+
+    def test_first_snapshot_is_changed(self):
+        """Test that the first snapshot is always broadcast."""
+        self.assertTrue(snapshot_changed(None, self.snapshot))
+
+    def test_small_temperature_change_ignored(self):
+        """Test temperature changes below threshold are not broadcast."""
+        current = self._copy()
+        current['temperature']['tank1'] = 60.05
+        current['status']['average_temperature'] = 60.52
+        self.assertFalse(snapshot_changed(self.snapshot, current))
+
+    def test_temperature_change_detected(self):
+        """Test temperature changes above threshold are broadcast."""
+        current = self._copy()
+        current['temperature']['tank1'] = 60.2
+        self.assertTrue(snapshot_changed(self.snapshot, current))
+
+    def test_sensor_failure_detected(self):
+        """Test a sensor dropping out is broadcast."""
+        current = self._copy()
+        current['temperature']['tank2'] = None
+        self.assertTrue(snapshot_changed(self.snapshot, current))
+
+    def test_status_change_detected(self):
+        """Test relay state changes are broadcast."""
+        current = self._copy()
+        current['status']['heating'] = True
+        self.assertTrue(snapshot_changed(self.snapshot, current))
+
+
 class TestErrorHandling(unittest.TestCase):
     """Test error handling and edge cases."""
 
@@ -484,6 +734,43 @@ class TestErrorHandling(unittest.TestCase):
             # Should not crash and should sanitize input
             self.assertIn(response.status_code, [200, 400, 500])
 
+    def test_invalid_history_query_parameters(self):
+        """Test history endpoints reject malformed or out-of-range query arguments."""
+        invalid_urls = [
+            '/api/history/temperature?hours=abc',
+            '/api/history/temperature?tank=7',
+            '/api/history/average?interval=0',
+            '/api/history/events?limit=-5',
+            '/api/statistics?hours=100000',
+        ]
+
+        for url in invalid_urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('error', json.loads(response.data))
+
+    def test_history_range_validation(self):
+        """Test range endpoints share date parsing and reject unknown kinds."""
+        for kind in ('average', 'events', 'control'):
+            response = self.client.get(
+                f'/api/history/{kind}/range?from=2024-01-01T00:00&to=2024-01-02T00:00'
+            )
+            self.assertEqual(response.status_code, 200, kind)
+
+            response = self.client.get(f'/api/history/{kind}/range?from=2024-01-01T00:00')
+            self.assertEqual(response.status_code, 400, kind)
+
+            response = self.client.get(f'/api/history/{kind}/range?from=yesterday&to=today')
+            self.assertEqual(response.status_code, 400, kind)
+
+            response = self.client.get(
+                f'/api/history/{kind}/range?from=2024-01-02T00:00&to=2024-01-01T00:00'
+            )
+            self.assertEqual(response.status_code, 400, kind)
+
+        response = self.client.get('/api/history/bogus/range?from=2024-01-01T00:00&to=2024-01-02T00:00')
+        self.assertEqual(response.status_code, 404)
+
     def test_extreme_parameter_values(self):
         """Test handling of extreme parameter values."""
         extreme_values = [
@@ -8,6 +8,8 @@ import unittest
 import tempfile
 import os
 import json
+import time
+from unittest.mock import patch
 
 from config import SystemConfig
 
@@ -67,6 +69,15 @@ class TestSystemConfig(unittest.TestCase):
         self.assertEqual(new_config.get('setpoint'), 75.0)
         self.assertEqual(new_config.get('hysteresis'), 3.0)
 
+    def test_save_keeps_file_format(self):
+        """Test the saved file keeps the 4-space indented JSON format."""
+        self.config.set('setpoint', 75.0)
+
+        with open(self.temp_config_path) as f:
+            content = f.read()
+
+        self.assertEqual(content, json.dumps(dict(self.config.snapshot()), indent=4))
+
     def test_load_corrupted_file(self):
         """Test loading corrupted JSON file."""
         # Write invalid JSON
@@ -133,6 +144,49 @@ class TestSystemConfig(unittest.TestCase):
         self.config.set('relay_heating', '1_01')
         self.assertEqual(self.config.get('relay_heating'), '1_01')
 
+    def test_snapshot_reused_until_change(self):
+        """Test settings snapshot is cached until a setting changes."""
+        snapshot = self.config.snapshot()
+        self.assertIs(self.config.snapshot(), snapshot)
+
+        self.config.set('setpoint', 72.0)
+        new_snapshot = self.config.snapshot()
+
+        self.assertIsNot(new_snapshot, snapshot)
+        self.assertEqual(new_snapshot['setpoint'], 72.0)
+        self.assertEqual(snapshot['setpoint'], 60.0)
+
+    def test_snapshot_is_read_only(self):
+        """Test settings snapshot cannot be modified."""
+        with self.assertRaises(TypeError):
+            self.config.snapshot()['setpoint'] = 99.0
+
+    def test_external_change_checked_once_per_interval(self):
+        """Test config file is stat'ed at most once per check interval."""
+        with open(self.temp_config_path, 'w') as f:
+            json.dump({'setpoint': 70.0}, f)
+        os.utime(self.temp_config_path, (0, 0))
+
+        self.config._last_check = time.monotonic()
+        with patch('config.os.stat', wraps=os.stat) as mock_stat:
+            self.config.get('setpoint')
+            self.config.get('hysteresis')
+            mock_stat.assert_not_called()
+
+        self.config._last_check -= SystemConfig.CACHE_CHECK_INTERVAL
+        self.assertEqual(self.config.get('setpoint'), 70.0)
+
+    def test_touched_file_not_reparsed(self):
+        """Test rewriting the file with identical content keeps the cached settings."""
+        self.config.set('setpoint', 65.0)
+        snapshot = self.config.snapshot()
+        os.utime(self.temp_config_path, (0, 0))
+
+        self.config._last_check -= SystemConfig.CACHE_CHECK_INTERVAL
+        with patch('config.orjson.loads') as mock_loads:
+            self.assertIs(self.config.snapshot(), snapshot)
+            mock_loads.assert_not_called()
+
 
 class TestConfigValidation(unittest.TestCase):
     """Test configuration validation logic."""
@@ -5,10 +5,11 @@ Tests the core temperature control functionality including hysteresis,
 safety limits, pump control, and error handling.
 """
 
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import Mock, MagicMock, patch
-from datetime import datetime, timedelta
-import pytz
 
 from control import TemperatureController
 from config import SystemConfig
@@ -29,7 +30,11 @@ class TestTemperatureController(unittest.TestCase):
         self.mock_evok.get_temperature.return_value = 50.0
         self.mock_evok.set_relay.return_value = True
 
-        # Create test configuration
+        # Create test configuration in a temporary file
+        self.temp_fd, self.temp_config_path = tempfile.mkstemp(suffix='.json')
+        self.original_config_file = SystemConfig.CONFIG_FILE
+        SystemConfig.CONFIG_FILE = self.temp_config_path
+        self.addCleanup(self._restore_config_file)
         self.config = SystemConfig()
         self.config.set('setpoint', 60.0)
         self.config.set('hysteresis', 2.0)
@@ -42,6 +47,13 @@ class TestTemperatureController(unittest.TestCase):
         # Create controller
         self.controller = TemperatureController(self.mock_evok, self.config)
 
+    def _restore_config_file(self):
+        """Restore the config file path and remove the temporary file."""
+        SystemConfig.CONFIG_FILE = self.original_config_file
+        os.close(self.temp_fd)
+        if os.path.exists(self.temp_config_path):
+            os.unlink(self.temp_config_path)
+
     def test_discover_sensors_success(self):
         """Test successful sensor discovery."""
         result = self.controller.discover_sensors()
@@ -64,10 +76,41 @@ class TestTemperatureController(unittest.TestCase):
         result = self.controller.discover_sensors()
         self.assertFalse(result)
 
+    def test_cached_sensors_used_when_recent(self):
+        """Test start-up reuses a recently discovered sensor list."""
+        self.controller.discover_sensors()
+        self.assertEqual(self.config.get('cached_sensor_ids'), ['sensor1', 'sensor2', 'sensor3'])
+
+        controller = TemperatureController(self.mock_evok, self.config)
+        self.assertTrue(controller.load_cached_sensors())
+        self.assertEqual(controller.sensor_ids, ['sensor1', 'sensor2', 'sensor3'])
+        self.assertTrue(controller.sensors_from_cache)
+
+        self.config.set('cached_sensor_time', time.time() - TemperatureController.SENSOR_CACHE_MAX_AGE - 1)
+        self.assertFalse(TemperatureController(self.mock_evok, self.config).load_cached_sensors())
+
+    def test_failed_cached_sensor_triggers_rediscovery(self):
+        """Test one unreadable cached sensor makes the control loop rediscover sensors."""
+        self.config.update({'cached_sensor_ids': ['sensor1', 'sensor2', 'old_sensor'],
+                            'cached_sensor_time': time.time()})
+        self.assertTrue(self.controller.load_cached_sensors())
+        readings = {'sensor1': 50.0, 'sensor2': 51.0, 'sensor3': 52.0}
+        self.mock_evok.get_temperature.side_effect = readings.get
+
+        with patch.object(self.controller, 'update_pump_control',
+                          side_effect=lambda settings: self.controller.stop_event.set()):
+            self.controller.control_loop()
+
+        self.mock_evok.get_all_sensors.assert_called_once()
+        self.assertEqual(self.controller.sensor_ids, ['sensor1', 'sensor2', 'sensor3'])
+        self.assertEqual(self.controller.temperatures, readings)
+        self.assertFalse(self.controller.sensors_from_cache)
+
     def test_read_temperatures(self):
         """Test reading temperatures from all sensors."""
         self.controller.sensor_ids = ['sensor1', 'sensor2', 'sensor3']
-        self.mock_evok.get_temperature.side_effect = [50.0, 51.0, 49.0]
+        readings = {'sensor1': 50.0, 'sensor2': 51.0, 'sensor3': 49.0}
+        self.mock_evok.get_temperature.side_effect = readings.get
 
         temps = self.controller.read_temperatures()
         self.assertEqual(len(temps), 3)
@@ -75,6 +118,51 @@ class TestTemperatureController(unittest.TestCase):
         self.assertEqual(temps['sensor2'], 51.0)
         self.assertEqual(temps['sensor3'], 49.0)
 
+    def test_read_temperatures_timeout(self):
+        """Test a sensor that does not answer within sensor_timeout reads as None."""
+        self.controller.sensor_ids = ['sensor1', 'sensor2']
+        self.config.set('sensor_timeout', 0.1)
+        self.addCleanup(self.config.set, 'sensor_timeout', 30)
+
+        def get_temperature(sensor_id):
+            if sensor_id == 'sensor2':
+                time.sleep(0.5)
+            return 50.0
+        self.mock_evok.get_temperature.side_effect = get_temperature
+
+        temps = self.controller.read_temperatures()
+        self.assertEqual(temps, {'sensor1': 50.0, 'sensor2': None})
+
+    def test_hung_sensor_not_queried_again(self):
+        """Test a sensor whose previous read still hangs is skipped and reads as None."""
+        self.controller.sensor_ids = ['sensor1', 'sensor2']
+        self.config.set('sensor_timeout', 0.1)
+        self.addCleanup(self.config.set, 'sensor_timeout', 30)
+
+        calls = []
+
+        def get_temperature(sensor_id):
+            calls.append(sensor_id)
+            if sensor_id == 'sensor2':
+                time.sleep(0.5)
+            return 50.0
+        self.mock_evok.get_temperature.side_effect = get_temperature
+
+        self.controller.read_temperatures()
+        temps = self.controller.read_temperatures()
+
+        self.assertEqual(temps, {'sensor1': 50.0, 'sensor2': None})
+        self.assertEqual(calls.count('sensor2'), 1)
+
+    def test_sensor_pool_sized_from_sensor_count(self):
+        """Test every sensor gets its own read worker."""
+        self.controller.sensor_ids = [f'sensor{i}' for i in range(1, 6)]
+
+        temps = self.controller.read_temperatures()
+
+        self.assertEqual(len(temps), 5)
+        self.assertEqual(self.controller._sensor_pool._max_workers, 5)
+
     def test_calculate_average_temperature(self):
         """Test average temperature calculation."""
         self.controller.temperatures = {
@@ -105,6 +193,15 @@ class TestTemperatureController(unittest.TestCase):
         avg = self.controller.calculate_average_temperature()
         self.assertIsNone(avg)
 
+    def test_map_tank_temperatures(self):
+        """Test sensor readings are mapped to tanks in discovery order."""
+        self.controller.sensor_ids = ['sensor1', 'sensor2']
+        self.controller.temperatures = {'sensor1': 50.0, 'sensor2': 55.0}
+        self.controller.average_temperature = 52.5
+
+        tanks = self.controller.map_tank_temperatures()
+        self.assertEqual(tanks, {'tank1': 50.0, 'tank2': 55.0, 'tank3': None, 'average': 52.5})
+
     def test_hysteresis_heating_on(self):
         """Test heating turns on when temperature below setpoint - hysteresis."""
         self.controller.average_temperature = 57.0  # Below 60 - 2 = 58
@@ -127,7 +224,7 @@ class TestTemperatureController(unittest.TestCase):
 
         self.mock_evok.set_relay.assert_any_call('1_01', False)  # Heating off
         self.assertFalse(self.controller.heating_active)
-        self.assertIsNotNone(self.controller.pump_shutdown_time)
+        self.assertIsNotNone(self.controller.pump_shutdown_deadline)
 
     def test_hysteresis_no_change_in_deadband(self):
         """Test heating state doesn't change within hysteresis deadband."""
@@ -168,34 +265,31 @@ class TestTemperatureController(unittest.TestCase):
         self.controller.heating_active = True
         self.controller.pump_active = True
 
-        before_time = datetime.now(pytz.timezone('Europe/Prague'))
+        before_time = time.monotonic()
         self.controller.update_heating_control()
-        after_time = datetime.now(pytz.timezone('Europe/Prague'))
 
         # Pump shutdown should be scheduled ~60 seconds from now
-        self.assertIsNotNone(self.controller.pump_shutdown_time)
-        expected_shutdown = before_time + timedelta(seconds=60)
+        self.assertIsNotNone(self.controller.pump_shutdown_deadline)
+        expected_shutdown = before_time + 60
         # Allow 2 second tolerance for test execution time
-        self.assertLess(abs((self.controller.pump_shutdown_time - expected_shutdown).total_seconds()), 2)
+        self.assertLess(abs(self.controller.pump_shutdown_deadline - expected_shutdown), 2)
 
     def test_pump_delayed_shutdown(self):
         """Test pump shuts down after delay expires."""
         # Set pump shutdown time in the past
-        past_time = datetime.now(pytz.timezone('Europe/Prague')) - timedelta(seconds=1)
-        self.controller.pump_shutdown_time = past_time
+        self.controller.pump_shutdown_deadline = time.monotonic() - 1
         self.controller.pump_active = True
 
         self.controller.update_pump_control()
 
         self.mock_evok.set_relay.assert_called_with('1_02', False)
         self.assertFalse(self.controller.pump_active)
-        self.assertIsNone(self.controller.pump_shutdown_time)
+        self.assertIsNone(self.controller.pump_shutdown_deadline)
 
     def test_pump_no_shutdown_before_delay(self):
         """Test pump doesn't shut down before delay expires."""
         # Set pump shutdown time in the future
-        future_time = datetime.now(pytz.timezone('Europe/Prague')) + timedelta(seconds=30)
-        self.controller.pump_shutdown_time = future_time
+        self.controller.pump_shutdown_deadline = time.monotonic() + 30
         self.controller.pump_active = True
 
         self.controller.update_pump_control()
@@ -266,6 +360,81 @@ class TestTemperatureController(unittest.TestCase):
         self.assertEqual(status['setpoint'], 60.0)
         self.assertTrue(status['heating_system_enabled'])
 
+    def test_get_status_uses_published_snapshot(self):
+        """Test status published by the control cycle is served read-only."""
+        self.controller.heating_active = True
+        self.controller.status_snapshot = self.controller.build_status(self.config.snapshot())
+        self.controller.heating_active = False
+
+        status = self.controller.get_status()
+
+        self.assertTrue(status['heating'])
+        with self.assertRaises(TypeError):
+            status['heating'] = False
+
+    def test_database_writes_batched(self):
+        """Test queued database writes are flushed in one batch."""
+        self.controller.db = Mock()
+        self.controller.average_temperature = 57.0
+
+        self.controller._queue_db_write('readings', ('sensor1', 57.0, 1), ('sensor2', 57.5, 2))
+        self.controller.update_heating_control()
+        self.controller._queue_db_write('events', ('error', 'test', None))
+        self.controller._db_queue.append(None)
+
+        self.controller._db_writer_loop()
+
+        self.controller.db.insert_batch.assert_called_once_with(
+            readings=[('sensor1', 57.0, 1), ('sensor2', 57.5, 2)],
+            events=[('error', 'test', None)],
+            actions=[('heating_on', True, True, 57.0, 60.0)]
+        )
+
+    def test_database_write_batch_bounded(self):
+        """Test a long write backlog is committed in bounded batches."""
+        self.controller.db = Mock()
+
+        with patch.object(TemperatureController, 'DB_WRITE_BATCH_SIZE', 2):
+            for i in range(3):
+                self.controller._queue_db_write('readings', ('sensor1', 50.0 + i, 1))
+            self.controller._db_queue.append(None)
+            self.controller._db_writer_loop()
+
+        self.assertEqual(self.controller.db.insert_batch.call_count, 2)
+
+    def test_failed_batch_retried_per_table(self):
+        """Test a failing table does not discard the other tables' rows."""
+        self.controller.db = Mock()
+
+        def insert_batch(readings=(), events=(), actions=()):
+            if events:
+                raise ValueError('bad event')
+        self.controller.db.insert_batch.side_effect = insert_batch
+
+        self.controller._queue_db_write('readings', ('sensor1', 57.0, 1))
+        self.controller._queue_db_write('events', ('error', 'test', None))
+        self.controller._db_queue.append(None)
+        self.controller._db_writer_loop()
+
+        self.controller.db.insert_batch.assert_any_call(readings=[('sensor1', 57.0, 1)])
+        self.controller.db.insert_batch.assert_any_call(events=[('error', 'test', None)])
+
+    def test_database_queue_drops_oldest_readings(self):
+        """Test a full write queue drops the oldest readings before other entries."""
+        self.controller.db = Mock()
+
+        with patch.object(TemperatureController, 'DB_QUEUE_MAX_ITEMS', 3):
+            self.controller._queue_db_write('events', ('startup', 'test', None))
+            self.controller._queue_db_write('readings', ('sensor1', 50.0, 1))
+            self.controller._queue_db_write('readings', ('sensor1', 51.0, 1))
+            self.controller._queue_db_write('readings', ('sensor1', 52.0, 1))
+
+        self.assertEqual(list(self.controller._db_queue), [
+            ('events', (('startup', 'test', None),)),
+            ('readings', (('sensor1', 51.0, 1),)),
+            ('readings', (('sensor1', 52.0, 1),)),
+        ])
+
 
 class TestTemperatureControlEdgeCases(unittest.TestCase):
     """Test edge cases and error conditions."""
@@ -273,6 +442,10 @@ class TestTemperatureControlEdgeCases(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.mock_evok = Mock()
+        self.temp_fd, self.temp_config_path = tempfile.mkstemp(suffix='.json')
+        self.original_config_file = SystemConfig.CONFIG_FILE
+        SystemConfig.CONFIG_FILE = self.temp_config_path
+        self.addCleanup(self._restore_config_file)
         self.config = SystemConfig()
         self.config.set('setpoint', 60.0)
         self.config.set('hysteresis', 2.0)
@@ -281,10 +454,18 @@ class TestTemperatureControlEdgeCases(unittest.TestCase):
         self.config.set('manual_override', False)  # Ensure manual mode is off
         self.controller = TemperatureController(self.mock_evok, self.config)
 
+    def _restore_config_file(self):
+        """Restore the config file path and remove the temporary file."""
+        SystemConfig.CONFIG_FILE = self.original_config_file
+        os.close(self.temp_fd)
+        if os.path.exists(self.temp_config_path):
+            os.unlink(self.temp_config_path)
+
     def test_sensor_failure_during_read(self):
         """Test handling of sensor failures during reading."""
         self.controller.sensor_ids = ['sensor1', 'sensor2', 'sensor3']
-        self.mock_evok.get_temperature.side_effect = [50.0, None, 52.0]
+        readings = {'sensor1': 50.0, 'sensor2': None, 'sensor3': 52.0}
+        self.mock_evok.get_temperature.side_effect = readings.get
 
         temps = self.controller.read_temperatures()
 
@@ -0,0 +1,447 @@
+"""
+Unit tests for the SQLite database layer.
+
+Tests schema migration, the temperature rollup, statistics and
+data retention against temporary database files.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from database import Database
+
+
+# Schema written by releases that stored DATETIME text timestamps
+LEGACY_SCHEMA = '''
+    CREATE TABLE temperature_readings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        sensor_id TEXT NOT NULL,
+        temperature REAL NOT NULL,
+        tank_number INTEGER
+    );
+    CREATE TABLE system_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        event_type TEXT NOT NULL,
+        description TEXT,
+        data TEXT
+    );
+    CREATE TABLE control_actions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        action_type TEXT NOT NULL,
+        heating_state BOOLEAN,
+        pump_state BOOLEAN,
+        average_temperature REAL,
+        setpoint REAL
+    );
+    CREATE INDEX idx_temp_timestamp ON temperature_readings(timestamp);
+    CREATE INDEX idx_actions_timestamp ON control_actions(timestamp);
+'''
+
+
+# Raw-reading equivalent of the averaged history, grouped by interval
+RAW_AVERAGE_SQL = '''
+    SELECT
+        datetime((timestamp / ?) * ?, 'unixepoch'),
+        AVG(CASE WHEN tank_number = 1 THEN temperature END),
+        AVG(CASE WHEN tank_number = 2 THEN temperature END),
+        AVG(CASE WHEN tank_number = 3 THEN temperature END),
+        AVG(temperature)
+    FROM temperature_readings
+    GROUP BY timestamp / ?
+    ORDER BY 1
+'''
+
+# (seconds after the start hour, tank number, temperature), spanning minute,
+# 5 and 10 minute bucket boundaries and a reading without a tank
+ROLLUP_READINGS = [
+    (0, 1, 50.0), (59, 1, 52.0), (60, 1, 54.0), (60, 2, 40.0),
+    (299, 2, 42.0), (300, 2, 44.0), (301, 3, 30.0), (301, None, 20.0),
+    (599, 1, 56.0), (600, 3, 32.0), (1799, 2, 46.0), (1800, 1, 58.0),
+]
+
+
+def epoch(text: str) -> int:
+    """Convert a UTC 'YYYY-MM-DD HH:MM:SS' string to unix seconds."""
+    return int(datetime.fromisoformat(text + '+00:00').timestamp())
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Base class providing a temporary database directory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db = None
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        if self.db:
+            self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def query(self, sql: str, params=()):
+        """Run a query on a separate connection and return all rows."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+
+class TestLegacyMigration(DatabaseTestCase):
+    """Test migration of DATETIME text timestamps to unix seconds."""
+
+    def setUp(self):
+        """Create a database in the legacy schema with known rows."""
+        super().setUp()
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        # CURRENT_TIMESTAMP stored UTC text; one winter and one summer time
+        conn.executemany(
+            'INSERT INTO temperature_readings (timestamp, sensor_id, temperature, tank_number) '
+            'VALUES (?, ?, ?, ?)',
+            [('2024-01-15 11:00:00', 'sensor1', 50.0, 1),
+             ('2024-01-15 11:00:30', 'sensor2', 52.0, 2),
+             ('2024-07-15 10:00:00', 'sensor1', 60.0, 1)]
+        )
+        conn.executemany(
+            'INSERT INTO system_events (timestamp, event_type, description, data) VALUES (?, ?, ?, ?)',
+            [('2024-01-15 11:00:00', 'startup', 'Started', None),
+             ('2024-07-15 10:00:00', 'error', 'Sensor lost', '{"sensor": "sensor3"}')]
+        )
+        conn.execute(
+            'INSERT INTO control_actions (timestamp, action_type, heating_state, pump_state, '
+            'average_temperature, setpoint) VALUES (?, ?, ?, ?, ?, ?)',
+            ('2024-07-15 10:00:00', 'heating_on', 1, 1, 55.0, 60.0)
+        )
+        conn.commit()
+        conn.close()
+
+        self.db = Database(self.db_path)
+
+    def test_row_counts_preserved(self):
+        """Test every legacy row is copied to the new tables."""
+        self.assertEqual(self.query('SELECT COUNT(*) FROM temperature_readings')[0][0], 3)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM system_events')[0][0], 2)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM control_actions')[0][0], 1)
+
+    def test_legacy_tables_dropped(self):
+        """Test the renamed legacy tables are removed after migration."""
+        tables = {name for (name,) in self.query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertFalse(any(name.endswith('_legacy') for name in tables))
+
+    def test_timestamps_converted_to_epoch(self):
+        """Test DATETIME text becomes integer unix seconds with ids and values intact."""
+        rows = self.query('SELECT id, timestamp, typeof(timestamp), sensor_id, temperature, tank_number '
+                          'FROM temperature_readings ORDER BY id')
+        self.assertEqual(rows, [
+            (1, epoch('2024-01-15 11:00:00'), 'integer', 'sensor1', 50.0, 1),
+            (2, epoch('2024-01-15 11:00:30'), 'integer', 'sensor2', 52.0, 2),
+            (3, epoch('2024-07-15 10:00:00'), 'integer', 'sensor1', 60.0, 1),
+        ])
+
+        columns = {row[1]: row[2] for row in self.query('PRAGMA table_info(temperature_readings)')}
+        self.assertEqual(columns['timestamp'], 'INTEGER')
+
+    def test_migrated_rows_returned_as_utc_text(self):
+        """Test API timestamps of migrated rows match the original UTC text."""
+        events = self.db.get_events_range(datetime(2024, 1, 1), datetime(2024, 12, 31))
+        self.assertEqual([e['timestamp'] for e in events],
+                         ['2024-07-15 10:00:00', '2024-01-15 11:00:00'])
+        self.assertEqual(events[0]['data'], '{"sensor": "sensor3"}')
+
+    def test_cet_range_matches_migrated_rows(self):
+        """Test CET date ranges select migrated rows across winter and summer time."""
+        # 11:00 UTC in January is 12:00 CET
+        winter = self.db.get_events_range(datetime(2024, 1, 15, 11, 59), datetime(2024, 1, 15, 12, 1))
+        self.assertEqual([e['event_type'] for e in winter], ['startup'])
+        self.assertEqual(self.db.get_events_range(datetime(2024, 1, 15, 10, 59),
+                                                  datetime(2024, 1, 15, 11, 1)), [])
+
+        # 10:00 UTC in July is 12:00 CEST
+        summer = self.db.get_control_history_range(datetime(2024, 7, 15, 11, 59),
+                                                   datetime(2024, 7, 15, 12, 1))
+        self.assertEqual(len(summer), 1)
+        self.assertEqual(summer[0]['action_type'], 'heating_on')
+        self.assertEqual((summer[0]['heating_state'], summer[0]['pump_state']), (1, 1))
+
+    def test_rollup_includes_migrated_readings(self):
+        """Test averaged history covers readings carried over from the legacy tables."""
+        averages = self.db.get_average_temperature_history_range(
+            datetime(2024, 1, 15, 11, 55), datetime(2024, 1, 15, 12, 5))
+        self.assertEqual(averages['tank1'], [50.0])
+        self.assertEqual(averages['tank2'], [52.0])
+        self.assertEqual(averages['average'], [51.0])
+
+    def test_migration_runs_once(self):
+        """Test reopening a migrated database leaves its rows unchanged."""
+        self.db.close()
+        self.db = Database(self.db_path)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM temperature_readings')[0][0], 3)
+        self.assertEqual(self.query('SELECT timestamp FROM system_events ORDER BY id'),
+                         [(epoch('2024-01-15 11:00:00'),), (epoch('2024-07-15 10:00:00'),)])
+
+
+class TestTemperatureRollup(DatabaseTestCase):
+    """Test the trigger-maintained rollup behind averaged history."""
+
+    def setUp(self):
+        """Create a database and insert readings starting an hour ago."""
+        super().setUp()
+        self.db = Database(self.db_path)
+        self.start = (int(time.time()) // 3600 - 1) * 3600
+        self.insert_readings(ROLLUP_READINGS)
+
+    def insert_readings(self, readings):
+        """Insert readings with explicit timestamps relative to the start hour."""
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(
+            'INSERT INTO temperature_readings (timestamp, sensor_id, temperature, tank_number) '
+            'VALUES (?, ?, ?, ?)',
+            [(self.start + offset, f'sensor{tank}', temp, tank) for offset, tank, temp in readings]
+        )
+        conn.commit()
+        conn.close()
+
+    def raw_averages(self, interval_minutes: int):
+        """Average the raw readings per interval, as column lists."""
+        seconds = interval_minutes * 60
+        rows = self.query(RAW_AVERAGE_SQL, (seconds, seconds, seconds))
+        return [list(column) for column in zip(*rows)]
+
+    def assert_matches_raw(self, averages, interval_minutes: int):
+        """Assert averaged history equals the raw GROUP BY result."""
+        expected = self.raw_averages(interval_minutes)
+        columns = ('timestamp', 'tank1', 'tank2', 'tank3', 'average')
+        self.assertEqual(averages['timestamp'], expected[0])
+        for index, column in enumerate(columns[1:], start=1):
+            for value, raw in zip(averages[column], expected[index]):
+                if raw is None:
+                    self.assertIsNone(value)
+                else:
+                    self.assertAlmostEqual(value, raw)
+
+    def test_average_history_matches_raw_readings(self):
+        """Test averaged history equals a raw GROUP BY for several intervals."""
+        for interval in (1, 5, 10, 15, 60):
+            with self.subTest(interval=interval):
+                averages = self.db.get_average_temperature_history(hours=3, interval_minutes=interval)
+                self.assert_matches_raw(averages, interval)
+
+    def test_average_history_range_matches_raw_readings(self):
+        """Test the date range variant regroups the rollup the same way."""
+        date_from = datetime.fromtimestamp(self.start - 60)
+        date_to = datetime.fromtimestamp(self.start + 3600)
+        with patch.object(Database, '_cet_to_epoch', side_effect=lambda dt: int(dt.timestamp())):
+            averages = self.db.get_average_temperature_history_range(date_from, date_to, 10)
+        self.assert_matches_raw(averages, 10)
+
+    def test_bucket_boundaries(self):
+        """Test readings on either side of a 5 minute boundary land in separate buckets."""
+        averages = self.db.get_average_temperature_history(hours=3, interval_minutes=5)
+        self.assertEqual(averages['tank1'][0], 52.0)  # 50, 52 and 54 before the boundary
+        self.assertEqual(averages['tank2'][:2], [41.0, 44.0])
+        self.assertEqual(averages['tank3'][1], 30.0)
+        self.assertEqual(averages['average'][1], (44.0 + 30.0 + 20.0 + 56.0) / 4)
+
+    def test_trigger_accumulates_existing_bucket(self):
+        """Test a later reading is added to its existing minute bucket."""
+        self.insert_readings([(30, 1, 60.0)])
+        rows = self.query('SELECT temperature_sum, reading_count FROM temperature_rollup '
+                          'WHERE bucket = ? AND tank_number = 1', (self.start,))
+        self.assertEqual(rows, [(162.0, 3)])
+        self.assert_matches_raw(self.db.get_average_temperature_history(hours=3, interval_minutes=5), 5)
+
+    def test_backfill_matches_trigger(self):
+        """Test rebuilding the rollup from stored readings gives the trigger's result."""
+        rollup_sql = 'SELECT bucket, tank_number, temperature_sum, reading_count FROM temperature_rollup ORDER BY 1, 2'
+        maintained = self.query(rollup_sql)
+
+        self.db.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('DROP TABLE temperature_rollup')
+        conn.commit()
+        conn.close()
+        self.db = Database(self.db_path)
+
+        self.assertEqual(self.query(rollup_sql), maintained)
+
+
+class TestStatistics(DatabaseTestCase):
+    """Test the statistics summary, including heating time from control actions."""
+
+    def setUp(self):
+        """Create an empty database."""
+        super().setUp()
+        self.db = Database(self.db_path)
+        self.now = int(time.time())
+
+    def insert(self, sql: str, rows):
+        """Insert rows with explicit timestamps on a separate connection."""
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(sql, rows)
+        conn.commit()
+        conn.close()
+
+    def insert_actions(self, actions):
+        """Insert (seconds ago, action_type) control actions."""
+        self.insert(
+            'INSERT INTO control_actions (timestamp, action_type, heating_state, pump_state, '
+            'average_temperature, setpoint) VALUES (?, ?, ?, ?, 55.0, 60.0)',
+            [(self.now - ago, action, int(action == 'heating_on'), int(action == 'heating_on'))
+             for ago, action in actions]
+        )
+
+    def test_empty_window(self):
+        """Test statistics of a window without data."""
+        stats = self.db.get_statistics(hours=1)
+
+        self.assertEqual(stats['overall'], {'reading_count': 0, 'avg_temperature': None,
+                                            'min_temperature': None, 'max_temperature': None})
+        self.assertEqual(stats['tanks'], [])
+        self.assertEqual(stats['control'], {'heating_on_time': 0, 'pump_on_time': 0,
+                                            'heating_cycles': 0})
+        self.assertEqual(stats['period_hours'], 1)
+
+    def test_temperature_statistics(self):
+        """Test overall and per-tank figures, with tankless readings only in the overall ones."""
+        self.insert(
+            'INSERT INTO temperature_readings (timestamp, sensor_id, temperature, tank_number) '
+            'VALUES (?, ?, ?, ?)',
+            [(self.now - 600, 'sensor1', 50.0, 1), (self.now - 300, 'sensor1', 54.0, 1),
+             (self.now - 300, 'sensor2', 40.0, 2), (self.now - 300, 'sensor9', 30.0, None),
+             (self.now - 7200, 'sensor1', 99.0, 1)]  # Outside the window
+        )
+
+        stats = self.db.get_statistics(hours=1)
+
+        self.assertEqual(stats['overall'], {'reading_count': 4, 'avg_temperature': 43.5,
+                                            'min_temperature': 30.0, 'max_temperature': 54.0})
+        self.assertEqual(stats['tanks'], [
+            {'tank_number': 1, 'reading_count': 2, 'avg_temperature': 52.0,
+             'min_temperature': 50.0, 'max_temperature': 54.0},
+            {'tank_number': 2, 'reading_count': 1, 'avg_temperature': 40.0,
+             'min_temperature': 40.0, 'max_temperature': 40.0},
+        ])
+
+    def test_heating_time_from_action_sequence(self):
+        """Test heating cycles and on-time, including a restarted and a still open cycle."""
+        self.insert_actions([
+            (7200, 'heating_on'),    # Outside the window
+            (3000, 'heating_on'),    # 600 s until heating_off
+            (2400, 'heating_off'),
+            (1200, 'heating_on'),    # Restarted by the next heating_on, adds no time
+            (1000, 'heating_on'),    # Still on: counts until now
+        ])
+
+        control = self.db.get_statistics(hours=1)['control']
+
+        self.assertEqual(control['heating_cycles'], 3)
+        self.assertAlmostEqual(control['heating_on_time'], 600 + 1000, delta=2)
+        self.assertEqual(control['pump_on_time'], control['heating_on_time'])
+
+    def test_heating_time_without_open_cycle(self):
+        """Test a window ending with heating off counts only closed cycles."""
+        self.insert_actions([(1800, 'heating_on'), (1500, 'heating_off'),
+                             (900, 'heating_on'), (600, 'heating_off')])
+
+        control = self.db.get_statistics(hours=1)['control']
+
+        self.assertEqual(control['heating_cycles'], 2)
+        self.assertEqual(control['heating_on_time'], 600)
+
+
+class TestCleanup(DatabaseTestCase):
+    """Test batched deletion of data beyond the retention period."""
+
+    OLD = 31 * 24 * 3600     # Seconds ago of rows past a 30 day retention
+    RECENT = 3600            # Seconds ago of rows to keep
+
+    def setUp(self):
+        """Create a database with old and recent rows in every table."""
+        super().setUp()
+        self.db = Database(self.db_path)
+        now = int(time.time())
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(
+            'INSERT INTO temperature_readings (timestamp, sensor_id, temperature, tank_number) '
+            'VALUES (?, ?, ?, ?)',
+            [(now - self.OLD + i, 'sensor' + 'x' * 100, 50.0, i % 3 + 1) for i in range(2000)]
+            + [(now - self.RECENT + i, 'sensor1', 55.0, 1) for i in range(3)]
+        )
+        conn.executemany(
+            'INSERT INTO system_events (timestamp, event_type, description, data) VALUES (?, ?, ?, ?)',
+            [(now - self.OLD, 'startup', 'old', None), (now - self.RECENT, 'startup', 'recent', None)]
+        )
+        conn.executemany(
+            'INSERT INTO control_actions (timestamp, action_type, heating_state, pump_state, '
+            'average_temperature, setpoint) VALUES (?, ?, 1, 1, 55.0, 60.0)',
+            [(now - self.OLD, 'heating_on'), (now - self.RECENT, 'heating_on')]
+        )
+        conn.commit()
+        conn.close()
+
+    def test_cleanup_in_batches(self):
+        """Test old rows are deleted in several batches and recent rows are kept."""
+        with patch.object(Database, 'DELETE_BATCH_SIZE', 500), \
+                patch('database.time.sleep') as mock_sleep:
+            self.db.cleanup_old_data(days_to_keep=30)
+
+        # 2000 old readings in batches of 500: a pause after each full batch
+        self.assertEqual(mock_sleep.call_count, 4)
+
+        self.assertEqual(self.query('SELECT COUNT(*), MIN(temperature) FROM temperature_readings')[0], (3, 55.0))
+        self.assertEqual(self.query('SELECT description FROM system_events'), [('recent',)])
+        self.assertEqual(self.query('SELECT COUNT(*) FROM control_actions')[0][0], 1)
+
+    def test_cleanup_trims_rollup(self):
+        """Test rollup buckets past the retention are deleted with their readings."""
+        self.db.cleanup_old_data(days_to_keep=30)
+
+        self.assertEqual(self.query('SELECT SUM(reading_count), SUM(temperature_sum) FROM temperature_rollup')[0],
+                         (3, 165.0))
+
+    def test_cleanup_reclaims_space(self):
+        """Test free pages are released, the WAL is truncated and statistics refreshed."""
+        with patch.object(Database, 'VACUUM_FREE_PAGE_THRESHOLD', 1):
+            self.db.cleanup_old_data(days_to_keep=30)
+
+        self.assertEqual(self.query('PRAGMA freelist_count')[0][0], 0)
+        self.assertEqual(os.path.getsize(self.db_path + '-wal'), 0)
+        self.assertTrue(self.query("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'temperature_readings'")[0][0])
+
+
+class TestAutoVacuum(DatabaseTestCase):
+    """Test incremental auto-vacuum setup."""
+
+    def test_new_database_uses_incremental_auto_vacuum(self):
+        """Test a new file is created with incremental auto-vacuum."""
+        self.db = Database(self.db_path)
+        self.assertEqual(self.query('PRAGMA auto_vacuum')[0][0], 2)
+
+    def test_existing_database_not_vacuumed_on_start(self):
+        """Test an existing file is only converted by an explicit full_vacuum()."""
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.close()
+
+        self.db = Database(self.db_path)
+        self.assertEqual(self.query('PRAGMA auto_vacuum')[0][0], 0)
+
+        self.db.full_vacuum()
+        self.assertEqual(self.query('PRAGMA auto_vacuum')[0][0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
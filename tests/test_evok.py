@@ -26,7 +26,7 @@ class TestEvokClient(unittest.TestCase):
         self.assertEqual(self.client.base_url, 'http://127.0.0.1:8080')
         self.assertEqual(self.client.ws_url, 'ws://127.0.0.1:8080/ws')
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_all_sensors_success(self, mock_get):
         """Test successful sensor discovery."""
         mock_response = Mock()
@@ -45,7 +45,22 @@ class TestEvokClient(unittest.TestCase):
         self.assertEqual(sensors[1]['circuit'], 'sensor2')
         mock_get.assert_called_once_with('http://127.0.0.1:8080/json/all', timeout=5)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
+    def test_connection_pool_sized_for_sensors(self, mock_get):
+        """Test the connection pool grows to the discovered sensor count."""
+        mock_response = Mock()
+        mock_response.json.return_value = [
+            {'dev': 'temp', 'type': 'DS18B20', 'circuit': f'sensor{i}'} for i in range(6)
+        ]
+        mock_get.return_value = mock_response
+
+        self.assertEqual(self.client.pool_size, EvokClient.POOL_SIZE)
+        self.client.get_all_sensors()
+
+        self.assertEqual(self.client.pool_size, 6)
+        self.assertEqual(self.client.session.adapters['http://']._pool_maxsize, 6)
+
+    @patch('evok_client.requests.Session.get')
     def test_get_all_sensors_network_error(self, mock_get):
         """Test sensor discovery with network error."""
         mock_get.side_effect = requests.exceptions.ConnectionError()
@@ -54,7 +69,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertIsNone(sensors)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_all_sensors_timeout(self, mock_get):
         """Test sensor discovery with timeout."""
         mock_get.side_effect = requests.exceptions.Timeout()
@@ -63,7 +78,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertIsNone(sensors)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_temperature_success(self, mock_get):
         """Test successful temperature reading."""
         mock_response = Mock()
@@ -76,7 +91,7 @@ class TestEvokClient(unittest.TestCase):
         self.assertEqual(temp, 55.5)
         mock_get.assert_called_once_with('http://127.0.0.1:8080/json/temp/sensor1', timeout=5)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_temperature_error(self, mock_get):
         """Test temperature reading with error."""
         mock_get.side_effect = requests.exceptions.RequestException()
@@ -85,7 +100,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertIsNone(temp)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_temperature_invalid_response(self, mock_get):
         """Test temperature reading with invalid response."""
         mock_response = Mock()
@@ -97,7 +112,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertEqual(temp, 0.0)  # Default value
 
-    @patch('evok_client.requests.post')
+    @patch('evok_client.requests.Session.post')
     def test_set_relay_on_success(self, mock_post):
         """Test successful relay control (ON)."""
         mock_response = Mock()
@@ -113,7 +128,7 @@ class TestEvokClient(unittest.TestCase):
             timeout=5
         )
 
-    @patch('evok_client.requests.post')
+    @patch('evok_client.requests.Session.post')
     def test_set_relay_off_success(self, mock_post):
         """Test successful relay control (OFF)."""
         mock_response = Mock()
@@ -129,7 +144,7 @@ class TestEvokClient(unittest.TestCase):
             timeout=5
         )
 
-    @patch('evok_client.requests.post')
+    @patch('evok_client.requests.Session.post')
     def test_set_relay_network_error(self, mock_post):
         """Test relay control with network error."""
         mock_post.side_effect = requests.exceptions.ConnectionError()
@@ -138,7 +153,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch('evok_client.requests.post')
+    @patch('evok_client.requests.Session.post')
     def test_set_relay_timeout(self, mock_post):
         """Test relay control with timeout."""
         mock_post.side_effect = requests.exceptions.Timeout()
@@ -147,7 +162,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_relay_state_on(self, mock_get):
         """Test reading relay state (ON)."""
         mock_response = Mock()
@@ -159,7 +174,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertTrue(state)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_relay_state_off(self, mock_get):
         """Test reading relay state (OFF)."""
         mock_response = Mock()
@@ -171,7 +186,7 @@ class TestEvokClient(unittest.TestCase):
 
         self.assertFalse(state)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_get_relay_state_error(self, mock_get):
         """Test reading relay state with error."""
         mock_get.side_effect = requests.exceptions.RequestException()
@@ -188,7 +203,7 @@ class TestEvokClientEdgeCases(unittest.TestCase):
         """Set up test fixtures."""
         self.client = EvokClient(host='192.168.1.100', port=8080)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_empty_sensor_list(self, mock_get):
         """Test handling of empty sensor list."""
         mock_response = Mock()
@@ -200,7 +215,7 @@ class TestEvokClientEdgeCases(unittest.TestCase):
 
         self.assertEqual(sensors, [])
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_malformed_json_response(self, mock_get):
         """Test handling of malformed JSON response."""
         mock_response = Mock()
@@ -212,7 +227,7 @@ class TestEvokClientEdgeCases(unittest.TestCase):
 
         self.assertIsNone(sensors)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_http_error_codes(self, mock_get):
         """Test handling of HTTP error codes."""
         error_codes = [400, 401, 403, 404, 500, 503]
@@ -226,7 +241,7 @@ class TestEvokClientEdgeCases(unittest.TestCase):
             sensors = self.client.get_all_sensors()
             self.assertIsNone(sensors)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_extreme_temperature_values(self, mock_get):
         """Test handling of extreme temperature values."""
         test_temps = [-55.0, 0.0, 125.0, 999.9]
@@ -247,7 +262,7 @@ class TestEvokClientEdgeCases(unittest.TestCase):
         self.assertEqual(client.base_url, 'http://192.168.2.100:9090')
         self.assertEqual(client.ws_url, 'ws://192.168.2.100:9090/ws')
 
-    @patch('evok_client.requests.post')
+    @patch('evok_client.requests.Session.post')
     def test_rapid_relay_switching(self, mock_post):
         """Test rapid relay on/off switching."""
         mock_response = Mock()
@@ -262,7 +277,7 @@ class TestEvokClientEdgeCases(unittest.TestCase):
 
         self.assertEqual(mock_post.call_count, 10)
 
-    @patch('evok_client.requests.get')
+    @patch('evok_client.requests.Session.get')
     def test_multiple_sensor_types(self, mock_get):
         """Test filtering of different sensor types."""
         mock_response = Mock()